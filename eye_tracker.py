@@ -5,18 +5,35 @@ from gazefollower.camera import WebCamCamera
 from enum import Enum
 import time
 import csv
+import queue
+import threading
 import cv2
 import numpy as np
 import os
+import io
+import mmap
+import tarfile
 from datetime import datetime
 
+# Encodage JPEG accéléré (SIMD) optionnel
+try:
+    from turbojpeg import TurboJPEG, TJPF_RGB
+except ImportError:
+    TurboJPEG = None
+
+# Compilation JIT optionnelle du calcul des statistiques
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 # Sauvegarder la fonction originale pygame.event.get
 _original_pygame_event_get = pygame.event.get
 _screenshot_callback = None
 
-def _patched_pygame_event_get():
+def _patched_pygame_event_get(*args, **kwargs):
     """Wrapper global pour intercepter F12 et Print Screen partout"""
-    events = _original_pygame_event_get()
+    events = _original_pygame_event_get(*args, **kwargs)
     filtered_events = []
 
     for event in events:
@@ -38,6 +55,36 @@ def _patched_pygame_event_get():
 # Remplacer pygame.event.get par notre version
 pygame.event.get = _patched_pygame_event_get
 
+# Taille maximale d'un lot d'images écrit d'un coup dans le fichier d'images de la session
+IMAGE_BATCH_FRAMES = 16
+IMAGE_BATCH_BYTES = 1 << 20
+
+# Espace disque réservé d'un coup pour le fichier d'images (évite de l'agrandir à chaque lot)
+IMAGE_ARENA_BYTES = 64 << 20
+
+# posix_fallocate n'existe pas sur macOS: on se contente alors d'agrandir le fichier
+_HAS_FALLOCATE = hasattr(os, "posix_fallocate")
+
+# os.writev n'existe que sur les systèmes POSIX, ailleurs les images sont regroupées dans une archive tar
+_HAS_WRITEV = hasattr(os, "writev")
+
+# Nombre de frames utilisées pour mesurer le FPS de la caméra au début d'un enregistrement
+FPS_PROBE_FRAMES = 30
+
+# Nombre de frames après lequel un texte rendu non réutilisé est retiré du cache
+TEXT_CACHE_TTL = 600
+
+# Surface.fblits n'existe qu'à partir de pygame 2.6
+_HAS_FBLITS = hasattr(pygame.Surface, "fblits")
+
+# Événements après lesquels la fenêtre doit être entièrement redessinée
+_REPAINT_EVENTS = (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED,
+                   pygame.WINDOWSIZECHANGED, pygame.WINDOWFOCUSGAINED)
+
+# Seuls événements mis en file par SDL (les autres, MOUSEMOTION en tête, sont ignorés à la source).
+# TEXTINPUT reste autorisé: pygame s'en sert pour remplir event.unicode des KEYDOWN.
+_APP_EVENTS = [pygame.QUIT, pygame.MOUSEBUTTONDOWN, pygame.KEYDOWN, pygame.TEXTINPUT, *_REPAINT_EVENTS]
+
 
 def detect_usb_camera():
     """
@@ -88,6 +135,266 @@ def detect_usb_camera():
         return 0
 
 
+def _create_jpeg_encoder():
+    """
+    Retourne une fonction frame RGB -> octets JPEG (qualité 85).
+    Utilise libjpeg-turbo (PyTurboJPEG) si disponible, sinon OpenCV.
+    """
+    if TurboJPEG is not None:
+        try:
+            turbo = TurboJPEG()
+        except Exception as e:
+            print(f"⚠️ libjpeg-turbo indisponible ({e}), encodage JPEG via OpenCV")
+        else:
+            # TurboJPEG accepte directement le RGB: pas de conversion vers BGR
+            return lambda frame: turbo.encode(frame, quality=85, pixel_format=TJPF_RGB)
+
+    def encode_with_opencv(frame):
+        # GazeFollower donne les frames en RGB, mais OpenCV attend du BGR
+        frame_bgr = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+        ok, jpeg = cv2.imencode(".jpg", frame_bgr, [cv2.IMWRITE_JPEG_QUALITY, 85])
+        if not ok:
+            raise RuntimeError("échec de l'encodage JPEG")
+        return jpeg
+
+    return encode_with_opencv
+
+
+def _gaze_stats_numpy(status, look, gaze_x):
+    """
+    Compte les échantillons regardant l'écran, avec tracking perdu et valides.
+    Retourne (screen, lost, valid).
+    """
+    screen = int(np.count_nonzero(look))
+    lost = status.shape[0] - int(np.count_nonzero(status))
+    valid = int(np.count_nonzero(status & ~np.isnan(gaze_x)))
+    return screen, lost, valid
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _gaze_stats(status, look, gaze_x):
+        """Même calcul que _gaze_stats_numpy, en une seule passe compilée"""
+        screen = 0
+        lost = 0
+        valid = 0
+        for i in range(status.shape[0]):
+            if look[i]:
+                screen += 1
+            if not status[i]:
+                lost += 1
+            elif not np.isnan(gaze_x[i]):
+                valid += 1
+        return screen, lost, valid
+
+    # Compiler dès l'import (ou charger depuis le cache) plutôt qu'à la fin de la session
+    _gaze_stats(np.zeros(1, np.bool_), np.zeros(1, np.bool_), np.zeros(1, np.float32))
+else:
+    _gaze_stats = _gaze_stats_numpy
+
+
+class ImageContainer:
+    """
+    Fichier unique d'images JPEG concaténées, accompagné d'un index CSV (nom, offset, taille).
+    Les images sont accumulées puis écrites par lots avec un seul os.writev, ce qui évite
+    un open/write/close par image. L'espace disque est réservé par blocs de
+    IMAGE_ARENA_BYTES et le fichier est ramené à sa taille réelle à la fermeture.
+    """
+
+    def __init__(self, images_dir):
+        self.data_path = os.path.join(images_dir, "images.jpgs")
+        self.index_path = os.path.join(images_dir, "images_index.csv")
+        self._fd = os.open(self.data_path, os.O_RDWR | os.O_CREAT, 0o644)
+        # Reprendre après la dernière image indexée (la fin du fichier peut être réservée mais vide)
+        self._offset = 0
+        new_index = not os.path.exists(self.index_path)
+        if not new_index:
+            with open(self.index_path, encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    self._offset = max(self._offset, int(row["offset"]) + int(row["length"]))
+        self._reserved = os.fstat(self._fd).st_size
+        os.lseek(self._fd, self._offset, os.SEEK_SET)
+        self._index = open(self.index_path, "a", encoding="utf-8")
+        if new_index:
+            self._index.write("name,offset,length\n")
+        self._pending = []
+        self._pending_bytes = 0
+
+    def _reserve(self, end):
+        """Réserve l'espace disque jusqu'à end (au moins un bloc IMAGE_ARENA_BYTES de plus)"""
+        size = max(end, self._reserved + IMAGE_ARENA_BYTES)
+        if _HAS_FALLOCATE:
+            try:
+                os.posix_fallocate(self._fd, self._reserved, size - self._reserved)
+            except OSError:
+                os.ftruncate(self._fd, size)  # Système de fichiers sans fallocate
+        else:
+            os.ftruncate(self._fd, size)
+        self._reserved = size
+
+    def add(self, name, jpeg):
+        """Ajoute une image encodée au lot courant et écrit le lot s'il est plein"""
+        self._pending.append((name, jpeg))
+        self._pending_bytes += len(jpeg)
+        if len(self._pending) >= IMAGE_BATCH_FRAMES or self._pending_bytes >= IMAGE_BATCH_BYTES:
+            self.flush()
+
+    def flush(self):
+        """Écrit le lot courant en un seul appel système puis met à jour l'index"""
+        if not self._pending:
+            return
+        if self._offset + self._pending_bytes > self._reserved:
+            self._reserve(self._offset + self._pending_bytes)
+        written = os.writev(self._fd, [jpeg for _, jpeg in self._pending])
+        if written < self._pending_bytes:
+            # Écriture partielle: compléter avec le reste du lot
+            rest = b"".join(bytes(jpeg) for _, jpeg in self._pending)[written:]
+            while rest:
+                rest = rest[os.write(self._fd, rest):]
+
+        rows = []
+        for name, jpeg in self._pending:
+            rows.append(f"{name},{self._offset},{len(jpeg)}\n")
+            self._offset += len(jpeg)
+        self._index.write("".join(rows))
+        self._index.flush()
+
+        self._pending = []
+        self._pending_bytes = 0
+
+    def close(self):
+        """Écrit le dernier lot, libère l'espace réservé inutilisé et ferme les fichiers"""
+        self.flush()
+        os.ftruncate(self._fd, self._offset)
+        os.close(self._fd)
+        self._index.close()
+
+
+def iter_session_images(images_dir):
+    """
+    Parcourt les images d'une session regroupées par ImageContainer ou ImageTarShard.
+    Le fichier est projeté en mémoire: chaque image est lue directement à son offset.
+
+    Yields:
+        tuple: (nom de l'image, octets JPEG)
+    """
+    index_path = os.path.join(images_dir, "images_index.csv")
+    data_path = os.path.join(images_dir, "images.jpgs")
+    if not os.path.exists(data_path):
+        data_path = os.path.join(images_dir, "images.tar")
+
+    with open(index_path, encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    if not rows:
+        return
+
+    with open(data_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        for row in rows:
+            offset = int(row["offset"])
+            yield row["name"], data[offset:offset + int(row["length"])]
+
+
+class ImageTarShard:
+    """
+    Archive tar non compressée regroupant les images JPEG d'une session (Windows).
+    Même interface que ImageContainer: un seul fichier ouvert, écrit séquentiellement
+    à travers un tampon de IMAGE_BATCH_BYTES, plus un index CSV (nom, offset, taille).
+    """
+
+    def __init__(self, images_dir):
+        self.data_path = os.path.join(images_dir, "images.tar")
+        self.index_path = os.path.join(images_dir, "images_index.csv")
+        append = os.path.exists(self.data_path)
+        self._file = open(self.data_path, "r+b" if append else "wb", buffering=IMAGE_BATCH_BYTES)
+        self._tar = tarfile.open(fileobj=self._file, mode="a" if append else "w", format=tarfile.USTAR_FORMAT)
+        new_index = not os.path.exists(self.index_path)
+        self._index = open(self.index_path, "a", encoding="utf-8")
+        if new_index:
+            self._index.write("name,offset,length\n")
+        self._rows = []
+
+    def add(self, name, jpeg):
+        """Ajoute une image encodée à l'archive"""
+        info = tarfile.TarInfo(name)
+        info.size = len(jpeg)
+        info.mtime = int(time.time())
+        self._tar.addfile(info, io.BytesIO(jpeg))
+        # Les données sont juste avant la position courante, complétées au bloc de 512 octets
+        padded = -(-info.size // tarfile.BLOCKSIZE) * tarfile.BLOCKSIZE
+        self._rows.append(f"{name},{self._tar.offset - padded},{info.size}\n")
+        if len(self._rows) >= IMAGE_BATCH_FRAMES:
+            self.flush()
+
+    def flush(self):
+        """Vide le tampon de l'archive puis met à jour l'index"""
+        if not self._rows:
+            return
+        self._file.flush()
+        self._index.write("".join(self._rows))
+        self._index.flush()
+        self._rows = []
+
+    def close(self):
+        """Termine l'archive et ferme les fichiers"""
+        self.flush()
+        self._tar.close()
+        self._file.close()
+        self._index.close()
+
+
+class GazeBuffer:
+    """
+    Échantillons de regard stockés en colonnes numpy (une colonne par champ).
+    Les colonnes sont préallouées et doublées quand elles sont pleines; seuls les
+    n premiers éléments sont valides. Un seul thread écrit (callback GazeFollower),
+    l'UI lit la dernière position.
+    """
+
+    def __init__(self, capacity=4096):
+        self.capacity = capacity
+        self.n = 0
+        self.ts = np.empty(capacity, np.int64)  # Horodatage caméra en nanosecondes
+        self.x = np.empty(capacity, np.float32)  # NaN si position inconnue
+        self.y = np.empty(capacity, np.float32)
+        self.status = np.empty(capacity, np.bool_)  # Tracking actif
+        self.look = np.empty(capacity, np.bool_)  # Regard dans les limites de l'écran
+
+    def append(self, ts, x, y, status, look):
+        """Ajoute un échantillon"""
+        n = self.n
+        if n == self.capacity:
+            self._grow()
+        self.ts[n] = ts
+        self.x[n] = x
+        self.y[n] = y
+        self.status[n] = status
+        self.look[n] = look
+        # Publier l'échantillon en dernier: les lecteurs n'utilisent que les indices < n
+        self.n = n + 1
+
+    def _grow(self):
+        """Double la capacité des colonnes"""
+        self.capacity *= 2
+        self.ts = np.resize(self.ts, self.capacity)
+        self.x = np.resize(self.x, self.capacity)
+        self.y = np.resize(self.y, self.capacity)
+        self.status = np.resize(self.status, self.capacity)
+        self.look = np.resize(self.look, self.capacity)
+
+    def latest(self):
+        """Retourne la dernière position de regard (x, y), ou None si le tracking est perdu"""
+        n = self.n
+        if n == 0:
+            return None
+        x = self.x[n - 1]
+        if np.isnan(x):
+            return None
+        return x, self.y[n - 1]
+
+    def __len__(self):
+        return self.n
+
+
 class AppState(Enum):
     IDLE = 0
     CALIBRATED = 1
@@ -95,7 +402,30 @@ class AppState(Enum):
     STOPPED = 3
 
 
+# Comparaison par identité dans le callback caméra
+_REC = AppState.RECORDING
+
+
 class EyeTrackerApp:
+    # Couleurs modernes (constantes de classe, partagées par toutes les frames)
+    BG_COLOR = (15, 23, 42)  # Bleu foncé moderne
+    CARD_BG = (30, 41, 59)  # Gris-bleu pour les cartes
+    ACCENT_PRIMARY = (59, 130, 246)  # Bleu vif
+    ACCENT_SUCCESS = (34, 197, 94)  # Vert
+    ACCENT_WARNING = (251, 146, 60)  # Orange
+    ACCENT_DANGER = (239, 68, 68)  # Rouge
+    TEXT_PRIMARY = (248, 250, 252)  # Blanc cassé
+    TEXT_SECONDARY = (148, 163, 184)  # Gris clair
+    BORDER_COLOR = (51, 65, 85)  # Bordure subtile
+
+    # Lignes de la carte de statistiques: (format appliqué à self.statistics, couleur)
+    _STATS_TEMPLATE = (
+        ("Durée totale: {total_duration:.1f}s", TEXT_PRIMARY),
+        ("Temps regardant l'écran: {time_looking_at_screen:.1f}s ({percentage_looking:.1f}%)", ACCENT_SUCCESS),
+        ("Temps tracking perdu: {time_tracking_lost:.1f}s ({percentage_lost:.1f}%)", ACCENT_WARNING),
+        ("Échantillons: {screen_samples} écran / {lost_samples} perdus / {total_samples} total", TEXT_SECONDARY),
+    )
+
     def __init__(self):
         pygame.init()
 
@@ -108,9 +438,14 @@ class EyeTrackerApp:
 
         # Configuration de l'écran en plein écran
         screen_size = self.gaze_follower.screen_size.tolist()
-        self.screen = pygame.display.set_mode(screen_size, pygame.FULLSCREEN)
+        self.screen = self._open_display(screen_size)
+        screen_size = self.screen.get_size()
         pygame.display.set_caption("Eye Tracker - Projet OraDys 3TT\nUniversité Paris 8 - Laboratoire Paragraphe")
 
+        # Ne laisser SDL mettre en file que les événements utilisés par l'application et les UIs GazeFollower
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(_APP_EVENTS)
+
         # Configurer le callback global de capture d'écran
         global _screenshot_callback
         _screenshot_callback = self.take_screenshot
@@ -121,21 +456,28 @@ class EyeTrackerApp:
         # Statistiques
         self.recording_start_time = None
         self.recording_end_time = None
-        self.gaze_data = []
         self.session_name = ""
 
+        # Échantillons de regard en colonnes numpy (agrandies par doublement)
+        self.gaze_data = GazeBuffer()
+
         # Sauvegarde d'images
         self.session_dir = None
         self.images_dir = None
-        self.last_image_save_time = 0
         self.image_save_interval = 2.0  # Sauvegarder 1 image toutes les 2 secondes (~1800 images/heure)
         self.image_counter = 0
+        # Cadence de sauvegarde en frames (recalculée à partir du FPS mesuré en début d'enregistrement)
+        self._save_every = 60
+        self._rec_first_frame = 0
+        self._fps_probe_ts = 0
+
+        # Écriture des images en arrière-plan (encodage JPEG + disque hors du callback caméra)
+        self._image_queue = None
+        self._image_writer_thread = None
+        self._images_dropped = 0
 
         # Debug: compteur de frames pour vérifier que le callback continue
         self.frame_count = 0
-        self.last_frame_log_time = 0
-        self.gaze_data_count = 0
-        self.last_gaze_log_time = 0
 
         # Flag pour quitter l'application proprement
         self.should_quit = False
@@ -144,10 +486,13 @@ class EyeTrackerApp:
         self.screen_width = screen_size[0]
         self.screen_height = screen_size[1]
 
-        # Données de visualisation en temps réel
+        # Données de visualisation en temps réel (le regard courant est lu dans les colonnes d'échantillons)
         self.current_frame = None
-        self.current_gaze_x = None
-        self.current_gaze_y = None
+        self._frame_slots = None  # Double buffer des frames caméra (alloué à la première frame)
+        self._frame_idx = 0
+        self._webcam_buf = np.empty((240, 320, 3), np.uint8)  # Aperçu webcam 320x240 RGB
+        self._webcam_surf = pygame.Surface((320, 240)).convert()  # Surface d'aperçu réutilisée
+        self.webcam_preview_smooth = False  # True: INTER_AREA (anti-aliasing) au lieu de INTER_NEAREST
 
         # Score de calibration
         self.calibration_score = None
@@ -159,20 +504,40 @@ class EyeTrackerApp:
         self.font_medium = pygame.font.Font(None, 36)
         self.font_small = pygame.font.Font(None, 28)
 
-        # Couleurs modernes
-        self.BG_COLOR = (15, 23, 42)  # Bleu foncé moderne
-        self.CARD_BG = (30, 41, 59)  # Gris-bleu pour les cartes
-        self.ACCENT_PRIMARY = (59, 130, 246)  # Bleu vif
-        self.ACCENT_SUCCESS = (34, 197, 94)  # Vert
-        self.ACCENT_WARNING = (251, 146, 60)  # Orange
-        self.ACCENT_DANGER = (239, 68, 68)  # Rouge
-        self.TEXT_PRIMARY = (248, 250, 252)  # Blanc cassé
-        self.TEXT_SECONDARY = (148, 163, 184)  # Gris clair
-        self.BORDER_COLOR = (51, 65, 85)  # Bordure subtile
-
         # Boutons avec positions relatives
         self.setup_buttons()
 
+        # Cache des textes rendus: (id police, texte, couleur) -> [surface, dernière frame d'utilisation]
+        self._text_cache = {}
+        # Glyphes pré-rendus des textes qui changent à chaque frame:
+        # (attribut de police, hauteur, couleur) -> {caractère: (surface, largeur)}
+        self._glyph_atlases = {}
+        self._stat_surfs = []  # Lignes de statistiques pré-rendues: (surface, (x, décalage y))
+        self._ui_frame = 0
+
+        # Éléments statiques pré-rendus (reconstruits quand l'état change)
+        self._static_bg = None
+        self._static_key = None
+        self._static_rects = []
+        self._full_flip = True  # Prochaine frame: envoyer tout l'écran (premier affichage, fenêtre ré-exposée)
+
+        # Redessin uniquement si l'affichage a changé (événement, nouvelle frame, nouveau regard)
+        self._dirty = True
+        self._new_frame = False
+        self._prerender_gaze_cursor()
+
+    @staticmethod
+    def _open_display(screen_size):
+        """Ouvre la fenêtre plein écran, avec SCALED + vsync quand SDL2 le permet"""
+        # EYETRACKER_NO_VSYNC=1 force l'ancien mode d'affichage (FULLSCREEN seul)
+        if pygame.get_sdl_version() >= (2, 0, 0) and not os.environ.get("EYETRACKER_NO_VSYNC"):
+            try:
+                return pygame.display.set_mode(screen_size,
+                                               pygame.FULLSCREEN | pygame.SCALED | pygame.DOUBLEBUF, vsync=1)
+            except pygame.error as e:
+                print(f"⚠️ Mode SCALED/vsync indisponible ({e}), retour au plein écran simple")
+        return pygame.display.set_mode(screen_size, pygame.FULLSCREEN)
+
     def setup_buttons(self):
         """Configure les positions des boutons"""
         button_width = 280
@@ -231,11 +596,87 @@ class EyeTrackerApp:
             button_height
         )
 
+        # Boutons affichés par état: (rect, texte, couleur, actif, action)
+        self._state_buttons = {
+            AppState.IDLE: [
+                (self.calibrate_button, "CALIBRER", self.ACCENT_PRIMARY, True, self.calibrate),
+            ],
+            AppState.CALIBRATED: [
+                (self.start_button, "DÉMARRER", self.ACCENT_SUCCESS, True, self.start_recording),
+                (self.recalibrate_button, "RECALIBRER", self.ACCENT_WARNING, True, self.calibrate),
+            ],
+            AppState.RECORDING: [
+                (self.start_button, "DÉMARRER", self.ACCENT_SUCCESS, False, None),
+                (self.stop_button, "ARRÊTER", self.ACCENT_DANGER, True, self.stop_recording),
+            ],
+            AppState.STOPPED: [
+                (self.new_session_same_calib_button, "CONTINUER", self.ACCENT_PRIMARY, True,
+                 self.new_session_same_calibration),
+                (self.new_session_new_calib_button, "RECALIBRER", self.ACCENT_WARNING, True, self.calibrate),
+                (self.quit_button, "QUITTER", self.ACCENT_DANGER, True, self.cleanup_and_quit),
+            ],
+        }
+
+        # Indicateur de tracking - en bas à gauche
+        status_width = 340
+        status_height = 70
+        self.status_rect = pygame.Rect(
+            25,
+            self.screen_height - status_height - 25,
+            status_width,
+            status_height
+        )
+
+    def _render(self, font, text, color):
+        """Rend un texte en réutilisant la surface déjà rasterisée si elle existe"""
+        key = (id(font), text, color)
+        entry = self._text_cache.get(key)
+        if entry is None:
+            entry = [font.render(text, True, color).convert_alpha(), self._ui_frame]
+            self._text_cache[key] = entry
+        else:
+            entry[1] = self._ui_frame
+        return entry[0]
+
+    def _blit_dynamic_text(self, surface, font_attr, text, color, pos):
+        """
+        Affiche un texte qui change à chaque frame (position du regard) glyphe par glyphe,
+        sans rasteriser la chaîne complète ni remplir le cache des textes.
+        font_attr est le nom de l'attribut de police (ex: "font_small")
+        """
+        font = getattr(self, font_attr)
+        key = (font_attr, font.get_height(), color)
+        atlas = self._glyph_atlases.get(key)
+        if atlas is None:
+            # ASCII imprimable rendu une seule fois par police et couleur
+            atlas = self._glyph_atlases[key] = {}
+            for code in range(32, 127):
+                glyph = font.render(chr(code), True, color).convert_alpha()
+                atlas[chr(code)] = (glyph, glyph.get_width())
+        x, y = pos
+        blits = []
+        for char in text:
+            entry = atlas.get(char)
+            if entry is None:
+                # Hors de l'atlas: rendu direct, sans agrandir l'atlas
+                glyph = font.render(char, True, color)
+                entry = (glyph, glyph.get_width())
+            blits.append((entry[0], (x, y)))
+            x += entry[1]
+        surface.blits(blits, doreturn=False)
+
+    def _prune_text_cache(self):
+        """Supprime les textes non utilisés depuis TEXT_CACHE_TTL frames"""
+        oldest = self._ui_frame - TEXT_CACHE_TTL
+        stale = [key for key, entry in self._text_cache.items() if entry[1] < oldest]
+        for key in stale:
+            del self._text_cache[key]
+
     def draw_rounded_rect(self, surface, color, rect, radius=15):
         """Dessine un rectangle avec coins arrondis"""
         pygame.draw.rect(surface, color, rect, border_radius=radius)
 
-    def draw_button(self, rect, text, color, enabled=True, icon=None):
+    def draw_button(self, surface, rect, text, color, enabled=True, icon=None):
         """Dessine un bouton moderne avec effet hover"""
         if not enabled:
             color = self.BORDER_COLOR
@@ -243,32 +684,32 @@ class EyeTrackerApp:
         # Effet d'ombre
         shadow_rect = rect.copy()
         shadow_rect.y += 4
-        self.draw_rounded_rect(self.screen, (0, 0, 0, 100), shadow_rect, 12)
+        self.draw_rounded_rect(surface, (0, 0, 0, 100), shadow_rect, 12)
 
         # Bouton principal
-        self.draw_rounded_rect(self.screen, color, rect, 12)
+        self.draw_rounded_rect(surface, color, rect, 12)
 
         # Bordure
-        pygame.draw.rect(self.screen, self.BORDER_COLOR if enabled else (80, 80, 80), rect, 2, border_radius=12)
+        pygame.draw.rect(surface, self.BORDER_COLOR if enabled else (80, 80, 80), rect, 2, border_radius=12)
 
         # Texte
         text_color = self.TEXT_PRIMARY if enabled else self.TEXT_SECONDARY
-        text_surf = self.font_medium.render(text, True, text_color)
+        text_surf = self._render(self.font_medium, text, text_color)
         text_rect = text_surf.get_rect(center=rect.center)
-        self.screen.blit(text_surf, text_rect)
+        surface.blit(text_surf, text_rect)
 
-    def draw_card(self, x, y, width, height, title=None):
+    def draw_card(self, surface, x, y, width, height, title=None):
         """Dessine une carte avec titre optionnel"""
         card_rect = pygame.Rect(x, y, width, height)
-        self.draw_rounded_rect(self.screen, self.CARD_BG, card_rect, 15)
-        pygame.draw.rect(self.screen, self.BORDER_COLOR, card_rect, 2, border_radius=15)
+        self.draw_rounded_rect(surface, self.CARD_BG, card_rect, 15)
+        pygame.draw.rect(surface, self.BORDER_COLOR, card_rect, 2, border_radius=15)
 
         if title:
-            title_surf = self.font_medium.render(title, True, self.TEXT_PRIMARY)
-            self.screen.blit(title_surf, (x + 25, y + 20))
+            title_surf = self._render(self.font_medium, title, self.TEXT_PRIMARY)
+            surface.blit(title_surf, (x + 25, y + 20))
             # Ligne de séparation sous le titre
             pygame.draw.line(
-                self.screen,
+                surface,
                 self.BORDER_COLOR,
                 (x + 20, y + 55),
                 (x + width - 20, y + 55),
@@ -277,21 +718,22 @@ class EyeTrackerApp:
             return y + 75  # Retourne la position Y après le titre avec plus d'espace
         return y + 25
 
-    def draw_calibration_quality(self):
+    def draw_calibration_quality(self, surface):
         """Affiche le score de qualité de calibration avec indicateur visuel"""
-        if self.calibration_score is None:
+        score = self.calibration_score
+        if score is None:
             return
 
         # Déterminer la qualité
-        if self.calibration_score < 0.05:
+        if score < 0.05:
             quality = "EXCELLENT"
             color = self.ACCENT_SUCCESS
             quality_text = "La calibration est excellente !"
-        elif self.calibration_score < 0.10:
+        elif score < 0.10:
             quality = "BONNE"
             color = self.ACCENT_PRIMARY
             quality_text = "La calibration est bonne."
-        elif self.calibration_score < 0.20:
+        elif score < 0.20:
             quality = "MOYENNE"
             color = self.ACCENT_WARNING
             quality_text = "Calibration acceptable. Recalibrer recommandé."
@@ -301,10 +743,15 @@ class EyeTrackerApp:
             quality_text = "Calibration faible. Veuillez recalibrer."
 
         # Carte de calibration
+        center_x = self.screen_width // 2
+        render = self._render
+        font_small = self.font_small
+        text_secondary = self.TEXT_SECONDARY
         card_y = int(self.screen_height * 0.28)
         card_height = 220
         start_y = self.draw_card(
-            self.screen_width // 2 - 350,
+            surface,
+            center_x - 350,
             card_y,
             700,
             card_height,
@@ -312,51 +759,52 @@ class EyeTrackerApp:
         )
 
         # Score avec plus d'espacement
-        score_text = f"Score: {self.calibration_score:.3f}"
-        score_surf = self.font_large.render(score_text, True, color)
-        score_rect = score_surf.get_rect(center=(self.screen_width // 2, start_y + 15))
-        self.screen.blit(score_surf, score_rect)
+        score_text = f"Score: {score:.3f}"
+        score_surf = render(self.font_large, score_text, color)
+        score_rect = score_surf.get_rect(center=(center_x, start_y + 15))
+        surface.blit(score_surf, score_rect)
 
         # Qualité
-        quality_surf = self.font_medium.render(quality, True, color)
-        quality_rect = quality_surf.get_rect(center=(self.screen_width // 2, start_y + 55))
-        self.screen.blit(quality_surf, quality_rect)
+        quality_surf = render(self.font_medium, quality, color)
+        quality_rect = quality_surf.get_rect(center=(center_x, start_y + 55))
+        surface.blit(quality_surf, quality_rect)
 
         # Description
-        desc_surf = self.font_small.render(quality_text, True, self.TEXT_SECONDARY)
-        desc_rect = desc_surf.get_rect(center=(self.screen_width // 2, start_y + 90))
-        self.screen.blit(desc_surf, desc_rect)
+        desc_surf = render(font_small, quality_text, text_secondary)
+        desc_rect = desc_surf.get_rect(center=(center_x, start_y + 90))
+        surface.blit(desc_surf, desc_rect)
 
         # Seuils de référence avec plus de padding en bas
         ref_text = "Seuils: <0.05 Excellent | 0.05-0.10 Bon | 0.10-0.20 Moyen | >0.20 Faible"
-        ref_surf = self.font_small.render(ref_text, True, self.TEXT_SECONDARY)
-        ref_rect = ref_surf.get_rect(center=(self.screen_width // 2, start_y + 120))
-        self.screen.blit(ref_surf, ref_rect)
+        ref_surf = render(font_small, ref_text, text_secondary)
+        ref_rect = ref_surf.get_rect(center=(center_x, start_y + 120))
+        surface.blit(ref_surf, ref_rect)
 
-    def draw_ui(self):
-        """Dessine l'interface utilisateur moderne"""
-        self.screen.fill(self.BG_COLOR)
+    def _rebuild_static_ui(self):
+        """Pré-rend le fond, l'en-tête, les cartes et les boutons de l'état courant"""
+        static_bg = pygame.Surface((self.screen_width, self.screen_height)).convert(self.screen)
+        static_bg.fill(self.BG_COLOR)
 
         # En-tête avec beaucoup de padding
         header_height = 160
-        pygame.draw.rect(self.screen, self.CARD_BG, (0, 0, self.screen_width, header_height))
-        pygame.draw.line(self.screen, self.ACCENT_PRIMARY, (0, header_height), (self.screen_width, header_height), 3)
+        pygame.draw.rect(static_bg, self.CARD_BG, (0, 0, self.screen_width, header_height))
+        pygame.draw.line(static_bg, self.ACCENT_PRIMARY, (0, header_height), (self.screen_width, header_height), 3)
 
         # Titre avec BEAUCOUP de padding au-dessus
         title_text = "Eye Tracker - Projet OraDys 3TT"
-        title_surf = self.font_title.render(title_text, True, self.TEXT_PRIMARY)
+        title_surf = self._render(self.font_title, title_text, self.TEXT_PRIMARY)
         title_rect = title_surf.get_rect(center=(self.screen_width // 2, 55))
-        self.screen.blit(title_surf, title_rect)
+        static_bg.blit(title_surf, title_rect)
 
         # Sous-titre avec BEAUCOUP de padding en dessous
         subtitle_text = "Université Paris 8 - Laboratoire Paragraphe | Jean Jacques SEROUL"
-        subtitle_surf = self.font_small.render(subtitle_text, True, self.TEXT_SECONDARY)
+        subtitle_surf = self._render(self.font_small, subtitle_text, self.TEXT_SECONDARY)
         subtitle_rect = subtitle_surf.get_rect(center=(self.screen_width // 2, 110))
-        self.screen.blit(subtitle_surf, subtitle_rect)
+        static_bg.blit(subtitle_surf, subtitle_rect)
 
         # Afficher la qualité de calibration si calibré (mais PAS en état STOPPED)
         if self.state in [AppState.CALIBRATED, AppState.RECORDING]:
-            self.draw_calibration_quality()
+            self.draw_calibration_quality(static_bg)
 
         # Badge "Enregistrement en cours" sous la carte de calibration avec padding
         if self.state == AppState.RECORDING:
@@ -372,80 +820,109 @@ class EyeTrackerApp:
                 badge_width,
                 badge_height
             )
-            self.draw_rounded_rect(self.screen, self.CARD_BG, badge_rect, 30)
-            pygame.draw.rect(self.screen, state_color, badge_rect, 3, border_radius=30)
+            self.draw_rounded_rect(static_bg, self.CARD_BG, badge_rect, 30)
+            pygame.draw.rect(static_bg, state_color, badge_rect, 3, border_radius=30)
 
-            state_surf = self.font_medium.render(state_text, True, state_color)
+            state_surf = self._render(self.font_medium, state_text, state_color)
             state_rect = state_surf.get_rect(center=badge_rect.center)
-            self.screen.blit(state_surf, state_rect)
+            static_bg.blit(state_surf, state_rect)
+
+            # Cadre pour la vidéo de la webcam
+            video_rect = pygame.Rect(self.screen_width - 320 - 30 - 5, 150 - 5, 320 + 10, 240 + 10)
+            self.draw_rounded_rect(static_bg, self.CARD_BG, video_rect, 10)
+            pygame.draw.rect(static_bg, self.ACCENT_PRIMARY, video_rect, 3, border_radius=10)
 
         # Boutons selon l'état
-        if self.state == AppState.IDLE:
-            self.draw_button(self.calibrate_button, "CALIBRER", self.ACCENT_PRIMARY, True)
-        elif self.state == AppState.CALIBRATED:
-            self.draw_button(self.start_button, "DÉMARRER", self.ACCENT_SUCCESS, True)
-            self.draw_button(self.recalibrate_button, "RECALIBRER", self.ACCENT_WARNING, True)
-        elif self.state == AppState.RECORDING:
-            self.draw_button(self.start_button, "DÉMARRER", self.ACCENT_SUCCESS, False)
-            self.draw_button(self.stop_button, "ARRÊTER", self.ACCENT_DANGER, True)
-        elif self.state == AppState.STOPPED:
-            self.draw_button(self.new_session_same_calib_button, "CONTINUER", self.ACCENT_PRIMARY, True)
-            self.draw_button(self.new_session_new_calib_button, "RECALIBRER", self.ACCENT_WARNING, True)
-            self.draw_button(self.quit_button, "QUITTER", self.ACCENT_DANGER, True)
+        buttons = self._state_buttons[self.state]
+        for rect, text, color, enabled, _ in buttons:
+            self.draw_button(static_bg, rect, text, color, enabled)
+
+        # Zones interactives: les seules à renvoyer à l'écran tant que le fond ne change pas
+        self._static_rects = [button[0] for button in buttons]
+        self._static_bg = static_bg
+        self._static_key = (self.state, self.calibration_score)
+
+    def draw_ui(self):
+        """Dessine l'interface utilisateur moderne"""
+        self._ui_frame += 1
+        if self._ui_frame % TEXT_CACHE_TTL == 0:
+            self._prune_text_cache()
+
+        # Le fond statique n'est reconstruit que si l'état ou le score change
+        screen = self.screen
+        state = self.state
+        rebuilt = self._static_key != (state, self.calibration_score)
+        if rebuilt:
+            self._rebuild_static_ui()
+        screen.blit(self._static_bg, (0, 0))
+        dirty_rects = self._static_rects
 
         # Affichage pendant l'enregistrement
-        if self.state == AppState.RECORDING:
-            # Webcam
+        if state == AppState.RECORDING:
+            # Webcam et curseur de regard composés en un seul appel
+            blit_list = []
             if self.current_frame is not None:
-                self.draw_webcam_feed()
+                self.draw_webcam_feed(blit_list)
 
-            # Curseur de regard
-            if self.current_gaze_x is not None and self.current_gaze_y is not None:
-                self.draw_gaze_cursor(self.current_gaze_x, self.current_gaze_y)
+            # Un seul instantané du dernier échantillon pour le curseur et le statut
+            gaze = self.gaze_data.latest()
+            if gaze is not None:
+                self.draw_gaze_cursor(gaze[0], gaze[1], blit_list)
+
+            if blit_list:
+                if _HAS_FBLITS:
+                    screen.fblits(blit_list)
+                else:
+                    screen.blits(blit_list, doreturn=False)
 
             # Indicateur de tracking
-            self.draw_tracking_status()
+            self.draw_tracking_status(gaze)
 
         # Statistiques si terminé
-        if self.state == AppState.STOPPED and self.recording_end_time:
-            self.show_statistics()
-
-        pygame.display.flip()
+        if state == AppState.STOPPED and self.recording_end_time:
+            stats_rect = self.show_statistics()
+            if stats_rect:
+                dirty_rects = dirty_rects + [stats_rect]
+
+        # L'enregistrement change à chaque frame: écran complet. Ailleurs, si le fond
+        # n'a pas changé, seules les zones susceptibles d'avoir changé sont envoyées
+        if state == AppState.RECORDING or rebuilt or self._full_flip:
+            self._full_flip = False
+            pygame.display.flip()
+        else:
+            pygame.display.update(dirty_rects)
 
-    def draw_tracking_status(self):
+    def draw_tracking_status(self, gaze):
         """Affiche le statut du tracking en bas de l'écran"""
         # Statut du tracking
-        is_tracking = self.current_gaze_x is not None and self.current_gaze_y is not None
-
-        status_width = 340
-        status_height = 70
-        status_rect = pygame.Rect(
-            25,
-            self.screen_height - status_height - 25,
-            status_width,
-            status_height
-        )
+        screen = self.screen
+        status_rect = self.status_rect
 
-        if is_tracking:
+        if gaze is not None:
             status_color = self.ACCENT_SUCCESS
             status_text = "✓ Tracking actif"
-            pos_text = f"Position: ({self.current_gaze_x:.0f}, {self.current_gaze_y:.0f})"
+            pos_text = f"Position: ({gaze[0]:.0f}, {gaze[1]:.0f})"
         else:
             status_color = self.ACCENT_DANGER
             status_text = "✗ Tracking perdu"
             pos_text = "En attente..."
 
-        self.draw_rounded_rect(self.screen, self.CARD_BG, status_rect, 12)
-        pygame.draw.rect(self.screen, status_color, status_rect, 3, border_radius=12)
+        self.draw_rounded_rect(screen, self.CARD_BG, status_rect, 12)
+        pygame.draw.rect(screen, status_color, status_rect, 3, border_radius=12)
 
-        text_surf = self.font_small.render(status_text, True, status_color)
-        self.screen.blit(text_surf, (status_rect.x + 20, status_rect.y + 12))
+        font_small = self.font_small
+        text_surf = self._render(font_small, status_text, status_color)
+        screen.blit(text_surf, (status_rect.x + 20, status_rect.y + 12))
 
-        pos_surf = self.font_small.render(pos_text, True, self.TEXT_SECONDARY)
-        self.screen.blit(pos_surf, (status_rect.x + 20, status_rect.y + 40))
+        pos_pos = (status_rect.x + 20, status_rect.y + 40)
+        if gaze is not None:
+            # La position change à chaque frame: assemblée à partir des glyphes en cache
+            self._blit_dynamic_text(screen, "font_small", pos_text, self.TEXT_SECONDARY, pos_pos)
+        else:
+            screen.blit(self._render(font_small, pos_text, self.TEXT_SECONDARY), pos_pos)
 
-    def draw_webcam_feed(self):
-        """Affiche le flux vidéo de la webcam"""
+    def draw_webcam_feed(self, blit_list):
+        """Ajoute le flux vidéo de la webcam à la liste de blits"""
         if self.current_frame is None:
             return
 
@@ -453,57 +930,68 @@ class EyeTrackerApp:
         display_height = 240
 
         try:
-            # Redimensionner et flip en une seule opération pour optimiser
-            frame_resized = cv2.resize(self.current_frame, (display_width, display_height), interpolation=cv2.INTER_LINEAR)
-            frame_flipped = cv2.flip(frame_resized, 1)
+            # Redimensionner puis flip directement dans le buffer préalloué (aucune allocation par frame)
+            # Plus proche voisin: suffisant pour un aperçu et bien plus rapide qu'une interpolation
+            interpolation = cv2.INTER_AREA if self.webcam_preview_smooth else cv2.INTER_NEAREST
+            cv2.resize(self.current_frame, (display_width, display_height), dst=self._webcam_buf,
+                       interpolation=interpolation)
+            cv2.flip(self._webcam_buf, 1, dst=self._webcam_buf)
 
-            # Conversion directe OpenCV (RGB numpy array) vers pygame - BEAUCOUP plus rapide que PIL
-            # GazeFollower fournit déjà les frames en RGB
-            frame_surface = pygame.surfarray.make_surface(np.transpose(frame_flipped, (1, 0, 2)))
+            # Copie directe dans la surface persistante, déjà au format de l'écran
+            # (GazeFollower fournit les frames en RGB; surfarray attend l'ordre (x, y))
+            pygame.surfarray.blit_array(self._webcam_surf, self._webcam_buf.swapaxes(0, 1))
 
             x_pos = self.screen_width - display_width - 30
             y_pos = 150
 
-            # Cadre pour la vidéo
-            video_rect = pygame.Rect(x_pos - 5, y_pos - 5, display_width + 10, display_height + 10)
-            self.draw_rounded_rect(self.screen, self.CARD_BG, video_rect, 10)
-            pygame.draw.rect(self.screen, self.ACCENT_PRIMARY, video_rect, 3, border_radius=10)
-
-            self.screen.blit(frame_surface, (x_pos, y_pos))
+            # Le cadre de la vidéo fait partie du fond statique
+            blit_list.append((self._webcam_surf, (x_pos, y_pos)))
         except Exception as e:
             print(f"Erreur affichage webcam: {e}")
             import traceback
             traceback.print_exc()
 
-    def draw_gaze_cursor(self, x, y):
-        """Dessine un curseur en croix moderne"""
+    def _prerender_gaze_cursor(self):
+        """Pré-rend le curseur de regard complet (glow, croix et cercle) sur une surface transparente"""
         cross_size = 25
         thickness = 4
         color = self.ACCENT_DANGER
 
+        # Surface 70x70 centrée sur le point de regard
+        size = 70
+        c = size // 2
+        cursor_surf = pygame.Surface((size, size), pygame.SRCALPHA)
+
         # Croix avec effet de glow
         for offset in [(0, 0), (1, 1), (-1, -1), (1, -1), (-1, 1)]:
-            alpha = 100 if offset != (0, 0) else 255
-            glow_color = (*color, alpha)
-
             # Ligne horizontale
-            pygame.draw.line(self.screen, color,
-                           (int(x - cross_size + offset[0]), int(y + offset[1])),
-                           (int(x + cross_size + offset[0]), int(y + offset[1])),
-                           thickness if offset == (0, 0) else 2)
+            pygame.draw.line(cursor_surf, color,
+                             (c - cross_size + offset[0], c + offset[1]),
+                             (c + cross_size + offset[0], c + offset[1]),
+                             thickness if offset == (0, 0) else 2)
             # Ligne verticale
-            pygame.draw.line(self.screen, color,
-                           (int(x + offset[0]), int(y - cross_size + offset[1])),
-                           (int(x + offset[0]), int(y + cross_size + offset[1])),
-                           thickness if offset == (0, 0) else 2)
+            pygame.draw.line(cursor_surf, color,
+                             (c + offset[0], c - cross_size + offset[1]),
+                             (c + offset[0], c + cross_size + offset[1]),
+                             thickness if offset == (0, 0) else 2)
 
         # Cercle central
-        pygame.draw.circle(self.screen, color, (int(x), int(y)), 8, thickness)
-        pygame.draw.circle(self.screen, self.BG_COLOR, (int(x), int(y)), 4)
+        pygame.draw.circle(cursor_surf, color, (c, c), 8, thickness)
+        pygame.draw.circle(cursor_surf, self.BG_COLOR, (c, c), 4)
+
+        self._cursor_surf = cursor_surf.convert_alpha()
+        self._cursor_half = c
+
+    def draw_gaze_cursor(self, x, y, blit_list):
+        """Ajoute le curseur en croix moderne à la liste de blits"""
+        half = self._cursor_half
+        blit_list.append((self._cursor_surf, (int(x) - half, int(y) - half)))
 
     def calibrate(self):
         """Lance la calibration puis démarre automatiquement l'enregistrement"""
         print("Lancement de la calibration...")
+        # L'UI de calibration dessine sur la même fenêtre: tout renvoyer à l'écran ensuite
+        self._full_flip = True
 
         # Créer l'UI de calibration
         from gazefollower.ui import CalibrationUI
@@ -548,58 +1036,77 @@ class EyeTrackerApp:
         print("Démarrage de l'enregistrement...")
         self.state = AppState.RECORDING
         self.recording_start_time = time.time()
-        self.gaze_data = []
+        self.gaze_data = GazeBuffer()
 
         # Réinitialiser la sauvegarde d'images
-        self.last_image_save_time = time.time()
+        cam_fps = getattr(self.gaze_follower.camera, 'cam_fps', 30)
+        self._save_every = max(1, round(self.image_save_interval * cam_fps))
+        self._rec_first_frame = self.frame_count
         self.image_counter = 0
+        self._start_image_writer()
 
         # Réinitialiser les données de visualisation
         self.current_frame = None
-        self.current_gaze_x = None
-        self.current_gaze_y = None
 
         # Wrapper callback pour capturer les frames
         self.original_camera_callback = self.gaze_follower.camera.callback_func
         self.original_camera_args = self.gaze_follower.camera.callback_args
         self.original_camera_kwargs = self.gaze_follower.camera.callback_kwargs
 
-        def wrapped_callback(state, timestamp, frame):
-            # PARTIE 1: Capture de frame (TOUJOURS exécutée, indépendante de GazeFollower)
-            try:
-                if self.state == AppState.RECORDING and frame is not None:
-                    # Capturer IMMÉDIATEMENT la frame avant tout traitement
-                    self.current_frame = frame.copy()
-                    self.frame_count += 1
-
-                    # Logger toutes les 5 secondes pour vérifier que ça tourne
-                    current_time = time.time()
-                    if current_time - self.last_frame_log_time >= 5.0:
-                        print(f"✓ Callback actif - {self.frame_count} frames capturées")
-                        self.last_frame_log_time = current_time
-
-                    # Sauvegarder une image périodiquement (toutes les 2 secondes)
-                    if current_time - self.last_image_save_time >= self.image_save_interval:
-                        try:
-                            self._save_frame_image(frame, timestamp)
-                            self.last_image_save_time = current_time
-                        except Exception as e:
-                            print(f"⚠️ Erreur sauvegarde image: {e}")
-            except Exception as e:
-                print(f"❌ Erreur capture frame: {e}")
-                import traceback
-                traceback.print_exc()
+        orig_callback = self.original_camera_callback
+        orig_args = self.original_camera_args
+        orig_kwargs = self.original_camera_kwargs
 
-            # PARTIE 2: Appel du callback GazeFollower (séparé pour éviter qu'un crash bloque tout)
+        def forward(state, timestamp, frame):
+            # Appel du callback GazeFollower (séparé pour éviter qu'un crash bloque tout)
             try:
-                if self.original_camera_callback:
-                    self.original_camera_callback(state, timestamp, frame, *self.original_camera_args, **self.original_camera_kwargs)
+                orig_callback(state, timestamp, frame, *orig_args, **orig_kwargs)
             except Exception as e:
                 print(f"❌ Erreur dans process_frame GazeFollower: {e}")
                 print("⚠️ Le tracking peut être perturbé mais la vidéo continue")
                 import traceback
                 traceback.print_exc()
 
+        def wrapped_callback(state, timestamp, frame):
+            if self.state is not _REC or frame is None:
+                if orig_callback:
+                    forward(state, timestamp, frame)
+                return
+
+            # Capturer IMMÉDIATEMENT la frame avant tout traitement, dans le slot que l'UI ne lit pas
+            slots = self._frame_slots
+            if slots is None or slots[0].shape != frame.shape:
+                slots = self._frame_slots = [np.empty_like(frame), np.empty_like(frame)]
+            w = self._frame_idx ^ 1
+            np.copyto(slots[w], frame)
+            self._frame_idx = w
+            self.current_frame = slots[w]
+            self._new_frame = True
+            frame_count = self.frame_count = self.frame_count + 1
+            rec_frames = frame_count - self._rec_first_frame
+
+            # Mesurer le FPS réel sur les premières frames (timestamps caméra en ns)
+            if rec_frames <= FPS_PROBE_FRAMES + 1:
+                if rec_frames == 1:
+                    self._fps_probe_ts = timestamp
+                elif rec_frames == FPS_PROBE_FRAMES + 1 and timestamp > self._fps_probe_ts:
+                    fps = FPS_PROBE_FRAMES * 1e9 / (timestamp - self._fps_probe_ts)
+                    self._save_every = max(1, round(self.image_save_interval * fps))
+
+            # Logger toutes les 256 frames (~8 secondes) pour vérifier que ça tourne
+            if frame_count & 0xFF == 0:
+                print(f"✓ Callback actif - {frame_count} frames capturées")
+
+            # Sauvegarder une image périodiquement (toutes les 2 secondes)
+            if rec_frames % self._save_every == 0:
+                try:
+                    self._save_frame_image(frame, timestamp)
+                except Exception as e:
+                    print(f"⚠️ Erreur sauvegarde image: {e}")
+
+            if orig_callback:
+                forward(state, timestamp, frame)
+
         self.gaze_follower.camera.set_on_image_callback(wrapped_callback)
         self.gaze_follower.add_subscriber(self.collect_gaze_data)
         self.gaze_follower.start_sampling()
@@ -608,17 +1115,26 @@ class EyeTrackerApp:
         """Demande le nom de la session à l'utilisateur - UNE SEULE FOIS"""
         user_text = ""
         print("\n📝 Saisie du nom de session...")
+        self._full_flip = True
+        # Le dialogue recouvre l'écran principal: à redessiner au retour
+        self._dirty = True
+
+        # Textes fixes rendus une seule fois, positions calculées à partir de leur taille
+        center_x = self.screen_width // 2
+        center_y = self.screen_height // 2
+        title_surf = self.font_large.render("Nom de la session", True, self.TEXT_PRIMARY)
+        title_pos = (center_x - title_surf.get_width() // 2, center_y - 100 - title_surf.get_height() // 2)
+        inst_surf = self.font_small.render("Appuyez sur ENTRÉE pour valider", True, self.TEXT_SECONDARY)
+        inst_pos = (center_x - inst_surf.get_width() // 2, center_y + 100 - inst_surf.get_height() // 2)
+        input_box = pygame.Rect(center_x - 300, center_y, 600, 60)
 
         while True:  # Boucle infinie - on sort avec return
             self.screen.fill(self.BG_COLOR)
 
             # Titre
-            title_surf = self.font_large.render("Nom de la session", True, self.TEXT_PRIMARY)
-            title_rect = title_surf.get_rect(center=(self.screen_width // 2, self.screen_height // 2 - 100))
-            self.screen.blit(title_surf, title_rect)
+            self.screen.blit(title_surf, title_pos)
 
             # Champ de texte
-            input_box = pygame.Rect(self.screen_width // 2 - 300, self.screen_height // 2, 600, 60)
             self.draw_rounded_rect(self.screen, self.CARD_BG, input_box, 10)
             pygame.draw.rect(self.screen, self.ACCENT_PRIMARY, input_box, 3, border_radius=10)
 
@@ -626,9 +1142,7 @@ class EyeTrackerApp:
             self.screen.blit(text_surf, (input_box.x + 15, input_box.y + 15))
 
             # Instruction
-            inst_surf = self.font_small.render("Appuyez sur ENTRÉE pour valider", True, self.TEXT_SECONDARY)
-            inst_rect = inst_surf.get_rect(center=(self.screen_width // 2, self.screen_height // 2 + 100))
-            self.screen.blit(inst_surf, inst_rect)
+            self.screen.blit(inst_surf, inst_pos)
 
             pygame.display.flip()
 
@@ -649,7 +1163,7 @@ class EyeTrackerApp:
                             user_text += event.unicode
 
     def _save_frame_image(self, frame, timestamp):
-        """Sauvegarde une frame dans le répertoire images"""
+        """Met une frame en file d'attente pour sauvegarde dans le répertoire images"""
         # Créer le répertoire images si nécessaire (lazy initialization)
         if self.images_dir is None:
             # Créer un nom temporaire basé sur le timestamp
@@ -661,18 +1175,60 @@ class EyeTrackerApp:
             os.makedirs(self.images_dir, exist_ok=True)
             print(f"Répertoire de session créé: {self.session_dir}")
 
-        # Incrémenter le compteur et sauvegarder
-        self.image_counter += 1
-        image_filename = f"{self.image_counter:04d}.jpg"
+        image_filename = f"{self.image_counter + 1:04d}.jpg"
         image_path = os.path.join(self.images_dir, image_filename)
 
-        # GazeFollower donne les frames en RGB, mais cv2.imwrite attend du BGR
-        # On inverse les canaux pour sauvegarder correctement
-        frame_bgr = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-        cv2.imwrite(image_path, frame_bgr, [cv2.IMWRITE_JPEG_QUALITY, 85])
+        # La copie est nécessaire: la caméra peut réutiliser son buffer à la frame suivante
+        try:
+            self._image_queue.put_nowait((frame.copy(), image_path))
+        except queue.Full:
+            self._images_dropped += 1
+            print(f"⚠️ File d'écriture pleine - image ignorée ({self._images_dropped} au total)")
+            return
+        self.image_counter += 1
+
+    def _start_image_writer(self):
+        """Démarre le thread d'écriture des images"""
+        self._image_queue = queue.Queue(maxsize=8)
+        self._images_dropped = 0
+        self._image_writer_thread = threading.Thread(target=self._image_writer, daemon=True)
+        self._image_writer_thread.start()
+
+    def _stop_image_writer(self):
+        """Vide la file d'écriture puis arrête le thread"""
+        if self._image_writer_thread is None:
+            return
+        self._image_queue.put(None)
+        self._image_writer_thread.join()
+        self._image_writer_thread = None
+
+    def _image_writer(self):
+        """Encode et écrit les images en attente jusqu'à réception de None"""
+        encode_jpeg = _create_jpeg_encoder()
+        written = 0
+        container = None
+        while True:
+            item = self._image_queue.get()
+            if item is None:
+                break
+            frame, image_path = item
+            try:
+                jpeg = encode_jpeg(frame)
+                if container is None:
+                    # Images regroupées dans un seul fichier par session
+                    images_dir = os.path.dirname(image_path)
+                    container = ImageContainer(images_dir) if _HAS_WRITEV else ImageTarShard(images_dir)
+                container.add(os.path.basename(image_path), jpeg)
+            except Exception as e:
+                print(f"⚠️ Erreur sauvegarde image: {e}")
+                continue
 
-        if self.image_counter % 30 == 0:  # Afficher tous les 30 images (~1 minute)
-            print(f"📸 {self.image_counter} images sauvegardées")
+            written += 1
+            if written % 30 == 0:  # Afficher tous les 30 images (~1 minute)
+                print(f"📸 {written} images sauvegardées")
+
+        if container is not None:
+            container.close()
 
     def stop_recording(self):
         """Arrête l'enregistrement"""
@@ -688,9 +1244,10 @@ class EyeTrackerApp:
                 self.original_camera_kwargs
             )
 
+        # Terminer l'écriture des images avant de renommer le répertoire
+        self._stop_image_writer()
+
         self.current_frame = None
-        self.current_gaze_x = None
-        self.current_gaze_y = None
 
         self.recording_end_time = time.time()
 
@@ -758,9 +1315,9 @@ class EyeTrackerApp:
     def collect_gaze_data(self, face_info, gaze_info):
         """Collecte les données de regard - Continue même si tracking perdu"""
         try:
-            # Toujours collecter, même si le tracking est perdu
-            gaze_x = None
-            gaze_y = None
+            # Toujours collecter, même si le tracking est perdu (position NaN)
+            gaze_x = np.nan
+            gaze_y = np.nan
             looking_at_screen = False
             tracking_status = False
 
@@ -770,56 +1327,42 @@ class EyeTrackerApp:
                     gaze_x = gaze_info.filtered_gaze_coordinates[0]
                     gaze_y = gaze_info.filtered_gaze_coordinates[1]
 
-                    # Mettre à jour la position actuelle
-                    self.current_gaze_x = gaze_x
-                    self.current_gaze_y = gaze_y
-
                     # Vérifier si dans les limites de l'écran
                     if 0 <= gaze_x <= self.screen_width and 0 <= gaze_y <= self.screen_height:
                         looking_at_screen = True
-            else:
-                # Tracking perdu - on réinitialise la position actuelle
-                # Mais on CONTINUE à collecter les données
-                self.current_gaze_x = None
-                self.current_gaze_y = None
+
+            # Tracking perdu: on CONTINUE à collecter les données (position NaN)
+            self._dirty = True
 
             # Enregistrer les données (même si tracking perdu)
-            self.gaze_data.append({
-                'timestamp': gaze_info.timestamp if gaze_info else time.time(),
-                'gaze_x': gaze_x,
-                'gaze_y': gaze_y,
-                'status': tracking_status,
-                'looking_at_screen': looking_at_screen,
-                'tracking_lost': not tracking_status
-            })
+            self.gaze_data.append(gaze_info.timestamp if gaze_info else time.time_ns(),
+                                  gaze_x, gaze_y, tracking_status, looking_at_screen)
         except Exception as e:
             # Ne PAS crasher si erreur - juste logger
             print(f"Erreur collecte données: {e}")
 
     def calculate_statistics(self):
         """Calcule les statistiques de regard"""
-        if not self.gaze_data:
+        data = self.gaze_data
+        n = data.n
+        if n == 0:
             print("Aucune donnée collectée")
             return
 
-        total_duration = self.recording_end_time - self.recording_start_time
-
-        # Échantillons regardant l'écran
-        samples_looking_at_screen = [d for d in self.gaze_data if d.get('looking_at_screen', False)]
-
-        # Échantillons avec tracking perdu
-        samples_tracking_lost = [d for d in self.gaze_data if d.get('tracking_lost', False)]
+        # Durée couverte par les échantillons, à partir des horodatages en nanosecondes
+        # (conversion en secondes une seule fois); horloge murale s'il n'y a qu'un échantillon
+        if n > 1:
+            total_duration = int(data.ts[n - 1] - data.ts[0]) * 1e-9
+        else:
+            total_duration = self.recording_end_time - self.recording_start_time
 
-        # Échantillons valides
-        valid_samples = [d for d in self.gaze_data if d['status'] and d['gaze_x'] is not None]
+        # Comptages sur la partie remplie des colonnes
+        samples_looking_at_screen, samples_tracking_lost, valid_samples = _gaze_stats(
+            data.status[:n], data.look[:n], data.x[:n])
 
         # Calculs temporels
-        if len(self.gaze_data) > 0:
-            time_looking_at_screen = (len(samples_looking_at_screen) / len(self.gaze_data)) * total_duration
-            time_tracking_lost = (len(samples_tracking_lost) / len(self.gaze_data)) * total_duration
-        else:
-            time_looking_at_screen = 0
-            time_tracking_lost = 0
+        time_looking_at_screen = (samples_looking_at_screen / n) * total_duration
+        time_tracking_lost = (samples_tracking_lost / n) * total_duration
 
         self.statistics = {
             'total_duration': total_duration,
@@ -827,12 +1370,14 @@ class EyeTrackerApp:
             'time_tracking_lost': time_tracking_lost,
             'percentage_looking': (time_looking_at_screen / total_duration * 100) if total_duration > 0 else 0,
             'percentage_lost': (time_tracking_lost / total_duration * 100) if total_duration > 0 else 0,
-            'total_samples': len(self.gaze_data),
-            'valid_samples': len(valid_samples),
-            'screen_samples': len(samples_looking_at_screen),
-            'lost_samples': len(samples_tracking_lost)
+            'total_samples': n,
+            'valid_samples': valid_samples,
+            'screen_samples': samples_looking_at_screen,
+            'lost_samples': samples_tracking_lost
         }
 
+        self._render_statistics()
+
         print("\n=== STATISTIQUES ===")
         print(f"Durée totale: {total_duration:.2f} secondes")
         print(f"Temps de regard sur l'écran: {time_looking_at_screen:.2f}s ({self.statistics['percentage_looking']:.1f}%)")
@@ -898,70 +1443,49 @@ class EyeTrackerApp:
         except Exception as e:
             print(f"❌ Erreur lors de la sauvegarde des statistiques: {e}")
 
-    def show_statistics(self):
-        """Affiche les statistiques sur l'écran"""
-        if not hasattr(self, 'statistics'):
-            return
-
+    def _render_statistics(self):
+        """Rend les lignes de statistiques en surfaces, positionnées relativement au contenu de la carte"""
         # Carte des statistiques avec plus d'espace
         card_width = 800
         card_height = 260
-        card_x = self.screen_width // 2 - card_width // 2
-        card_y = int(self.screen_height * 0.38)
-
-        start_y = self.draw_card(card_x, card_y, card_width, card_height, "Statistiques de la Session")
-
-        stats_data = [
-            (f"Durée totale: {self.statistics['total_duration']:.1f}s", self.TEXT_PRIMARY),
-            (f"Temps regardant l'écran: {self.statistics['time_looking_at_screen']:.1f}s ({self.statistics['percentage_looking']:.1f}%)",
-             self.ACCENT_SUCCESS),
-            (f"Temps tracking perdu: {self.statistics['time_tracking_lost']:.1f}s ({self.statistics['percentage_lost']:.1f}%)",
-             self.ACCENT_WARNING),
-            (f"Échantillons: {self.statistics['screen_samples']} écran / {self.statistics['lost_samples']} perdus / {self.statistics['total_samples']} total",
-             self.TEXT_SECONDARY)
-        ]
-
-        y_offset = start_y + 5
-        for text, color in stats_data:
-            text_surf = self.font_medium.render(text, True, color)
-            text_rect = text_surf.get_rect(center=(self.screen_width // 2, y_offset))
-            self.screen.blit(text_surf, text_rect)
+        self._stats_card_rect = pygame.Rect(self.screen_width // 2 - card_width // 2,
+                                            int(self.screen_height * 0.38), card_width, card_height)
+
+        self._stat_surfs = []
+        y_offset = 5
+        for template, color in self._STATS_TEMPLATE:
+            text_surf = self.font_medium.render(template.format(**self.statistics), True, color).convert_alpha()
+            x = self.screen_width // 2 - text_surf.get_width() // 2
+            self._stat_surfs.append((text_surf, (x, y_offset - text_surf.get_height() // 2)))
             y_offset += 45
 
+    def show_statistics(self):
+        """Affiche les statistiques sur l'écran et retourne le rectangle de la carte"""
+        if not self._stat_surfs:
+            return None
+
+        card = self._stats_card_rect
+        start_y = self.draw_card(self.screen, card.x, card.y, card.width, card.height, "Statistiques de la Session")
+
+        # Lignes de texte rendues une seule fois dans calculate_statistics
+        self.screen.blits([(surf, (x, start_y + dy)) for surf, (x, dy) in self._stat_surfs], doreturn=False)
+
+        return card
+
     def handle_click(self, pos):
-        """Gère les clics de souris"""
-        if self.calibrate_button.collidepoint(pos):
-            if self.state == AppState.IDLE:
-                self.calibrate()
-
-        elif self.start_button.collidepoint(pos):
-            if self.state == AppState.CALIBRATED:
-                self.start_recording()
-
-        elif self.stop_button.collidepoint(pos):
-            if self.state == AppState.RECORDING:
-                self.stop_recording()
-
-        elif self.recalibrate_button.collidepoint(pos):
-            if self.state == AppState.CALIBRATED:
-                self.calibrate()
-
-        elif self.new_session_same_calib_button.collidepoint(pos):
-            if self.state == AppState.STOPPED:
-                # Nouvelle session avec la même calibration
-                self.state = AppState.CALIBRATED
-                self.recording_start_time = None
-                self.recording_end_time = None
-                self.gaze_data = []
-
-        elif self.new_session_new_calib_button.collidepoint(pos):
-            if self.state == AppState.STOPPED:
-                # Nouvelle session avec recalibration
-                self.calibrate()
-
-        elif self.quit_button.collidepoint(pos):
-            if self.state == AppState.STOPPED:
-                self.cleanup_and_quit()
+        """Gère les clics de souris: seuls les boutons actifs de l'état courant sont testés"""
+        for rect, _, _, enabled, action in self._state_buttons[self.state]:
+            if enabled and rect.collidepoint(pos):
+                action()
+                return
+
+    def new_session_same_calibration(self):
+        """Nouvelle session avec la même calibration"""
+        self.state = AppState.CALIBRATED
+        self.recording_start_time = None
+        self.recording_end_time = None
+        self.gaze_data = GazeBuffer()
+        self._stat_surfs = []
 
     def cleanup_and_quit(self):
         """Nettoie et quitte l'application"""
@@ -1036,8 +1560,20 @@ class EyeTrackerApp:
                 running = False
                 break
 
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
+            # Webcam perdue (plus aucune image): inutile de continuer
+            capture_error = getattr(self.gaze_follower.camera, 'capture_error', None)
+            if capture_error is not None:
+                print(f"❌ Capture caméra arrêtée: {capture_error}")
+                running = False
+                break
+
+            for event in pygame.event.get(_APP_EVENTS):
+                # Seuls les événements utiles sont en file: chacun peut changer l'affichage
+                self._dirty = True
+
+                if event.type in _REPAINT_EVENTS:
+                    self._full_flip = True
+                elif event.type == pygame.QUIT:
                     running = False
                 elif event.type == pygame.MOUSEBUTTONDOWN:
                     self.handle_click(event.pos)
@@ -1050,7 +1586,11 @@ class EyeTrackerApp:
                             print("Appuyez sur ESCAPE à nouveau pour quitter")
                     # F12 et Print Screen sont gérés globalement par le wrapper pygame.event.get
 
-            self.draw_ui()
+            # Ne redessiner que si quelque chose a changé depuis la dernière frame
+            if self._dirty or self._new_frame or self._static_key != (self.state, self.calibration_score):
+                self._dirty = False
+                self._new_frame = False
+                self.draw_ui()
             clock.tick(30)
 
         print("🔧 Nettoyage et fermeture...")
@@ -29,6 +29,8 @@ from .ui import CameraPreviewerUI, CalibrationUI
 # Email: zhugc2016@gmail.com
 
 class GazeFollower:
+    # Buffer size of the temporary sample file, rows are written to disk in 1 MiB chunks
+    _SAMPLE_STREAM_BUFFER_SIZE = 1 << 20
 
     def __init__(self, camera: Camera = WebCamCamera(),
                  face_alignment: FaceAlignment = MediaPipeFaceAlignment(),
@@ -448,8 +450,8 @@ class GazeFollower:
             Log.e("Trigger must be an integer, but you gave {}".format(type(self._trigger)))
             raise Exception("Trigger must be an integer, but you gave {}".format(type(self._trigger)))
 
+        # Rows accumulate in the stream buffer; save_data() flushes them with close()
         self._tmpSampleDataSteam.write(self._gaze_info_2_string(gaze_info, tmp_trigger))
-        self._tmpSampleDataSteam.flush()
 
     def _create_session(self, session_name: str):
         """
@@ -491,7 +493,8 @@ class GazeFollower:
         Log.init(_logFile)
 
         self._tmpSampleDataPath = _tmpDir.joinpath(f"em_{session_name}_{_timeString}.csv")
-        self._tmpSampleDataSteam = self._tmpSampleDataPath.open("w", encoding="utf-8")
+        self._tmpSampleDataSteam = self._tmpSampleDataPath.open("w", encoding="utf-8",
+                                                                buffering=self._SAMPLE_STREAM_BUFFER_SIZE)
         self._tmpSampleDataSteam.write(
             "timestamp,raw_gaze_position_x,raw_gaze_position_y,"
             "calibrated_gaze_position_x,calibrated_gaze_position_y,"
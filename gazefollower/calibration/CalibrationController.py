@@ -127,7 +127,8 @@ class CalibrationController:
         Args:
             raw_pos (tuple): Input position coordinates, could be either
                 (percentage_x, percentage_y) if using relative units, or
-                (cm_x, cm_y) if physical screen size is available.
+                (cm_x, cm_y) if physical screen size is available. Each coordinate
+                may also be a NumPy array to convert several positions at once.
 
         Returns:
             tuple: Pixel coordinates (x, y) converted based on input format.
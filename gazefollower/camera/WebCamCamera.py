@@ -2,11 +2,12 @@
 # encoding=utf-8
 # Author: GC Zhu
 # Email: zhugc2016@gmail.com
-import sys
+import queue
 import threading
 import time
 
 import cv2
+import numpy as np
 
 from .Camera import Camera  # Adjust import according to your package structure
 from ..logger import Log
@@ -16,8 +17,10 @@ class WebCamCamera(Camera):
     """
     A class to manage webcam operations, inheriting from the base Camera class.
     """
+    # Consecutive failed grabs after which the webcam is considered gone
+    _MAX_GRAB_FAILURES = 100
 
-    def __init__(self, webcam_id=0, img_height=480, img_width=640, cam_fps=30):
+    def __init__(self, webcam_id=0, img_height=480, img_width=640, cam_fps=30, dispatch_fps=None):
         """
         Initializes the WebCamCamera object, sets up the camera properties,
         creates the capture thread, and ensures the save directory exists.
@@ -28,56 +31,144 @@ class WebCamCamera(Camera):
             Which webcam camera is connected.
         cap: cv2.VideoCapture
             The instance of cv2.VideoCapture and it can be None.
+        dispatch_fps : float or None
+            Maximum rate at which frames are decoded and passed to the callback.
+            Frames grabbed in between are dropped without being decoded.
+            None dispatches every frame the camera delivers.
         """
         super().__init__()
-        self._camera_thread_running = None
+        self._stop_event = threading.Event()  # Set to stop the capture pipeline
+        # Fatal capture failure (webcam closed or no longer delivering frames);
+        # the pipeline stops when it is set
+        self.capture_error = None
         self._camera_thread = None
+        self._pipeline_threads = []
+        self._raw_queue = None
+        self._frame_queue = None
         self.webcam_id = webcam_id
         self.img_height = img_height
         self.img_width = img_width
         self.cam_fps = cam_fps
+        self._min_interval_ns = int(1e9 / dispatch_fps) if dispatch_fps else 0
+        self._last_dispatch_ns = 0
         self._cap = cv2.VideoCapture()
         # La résolution et le FPS seront configurés lors de l'ouverture dans open()
 
     def _create_capture_thread(self):
         """
-        Creates and starts a daemon thread for continuously capturing frames from the camera.
+        Creates and starts the daemon threads of the capture pipeline:
+        grab/decode -> preprocessing (resize, BGR to RGB) -> callback.
+        The stages are connected by small bounded queues so that decoding,
+        preprocessing and the callback of consecutive frames overlap.
         """
-        self._camera_thread_running = True
+        self._stop_event.clear()
+        self.capture_error = None
+        self._raw_queue = queue.Queue(maxsize=2)
+        self._frame_queue = queue.Queue(maxsize=2)
         self._camera_thread = threading.Thread(target=self.capture)
-        self._camera_thread.daemon = True
-        self._camera_thread.start()
+        self._pipeline_threads = [
+            self._camera_thread,
+            threading.Thread(target=self._preprocess),
+            threading.Thread(target=self._dispatch),
+        ]
+        for thread in self._pipeline_threads:
+            thread.daemon = True
+            thread.start()
 
     def capture(self):
         """
-        Continuously captures frames from the webcam while the camera is in specific running states.
-        If a callback is set, it executes the callback function with the current frame.
+        Continuously grabs frames from the webcam while the camera is running and
+        hands the decoded frames to the preprocessing stage.
         """
-        while self._camera_thread_running:
-            # Capture a frame from the webcam.
-            ret, frame = self._cap.read()
+        raw_queue = self._raw_queue
+        stop_event = self._stop_event
+        failures = 0
+        while not stop_event.is_set():
+            # Grab a frame from the webcam; it is only decoded if it will be dispatched.
+            if not self._cap.grab():
+                Log.w("Failed to grab frame")
+                failures += 1
+                if failures >= self._MAX_GRAB_FAILURES or not self._cap.isOpened():
+                    # The webcam is gone: report it to the owner of the camera and stop the pipeline
+                    self.capture_error = RuntimeError("Webcam stopped delivering frames")
+                    Log.e(str(self.capture_error))
+                    stop_event.set()
+                continue
+            failures = 0
             # Capture the current timestamp.
             timestamp = time.time_ns()
+            if timestamp - self._last_dispatch_ns < self._min_interval_ns:
+                continue
+            # The next stages are still busy: drop this frame before paying for its decoding.
+            if raw_queue.full():
+                continue
+
+            ret, frame = self._cap.retrieve()
             if not ret:
-                Log.w("Failed to grab frame")
+                Log.w("Failed to retrieve frame")
                 continue
+            self._last_dispatch_ns = timestamp
+            raw_queue.put((timestamp, frame))
+        raw_queue.put(None)
 
-            # Check if the frame is in BGR format (default for OpenCV) and convert to RGB if necessary
-            # Preprocessing image data
+    def _preprocess(self):
+        """
+        Resizes the grabbed frames and converts them to RGB, then queues them for the callback.
+        """
+        raw_queue = self._raw_queue
+        frame_queue = self._frame_queue
+        size = (self.img_width, self.img_height)
+        # Resize outputs rotate through a ring of preallocated buffers. A buffer is reused only
+        # after every frame that may still be referenced has moved on: the frames waiting in
+        # frame_queue, the one in the callback and the previous one (kept by the previewer).
+        resize_bufs = None
+        buf_idx = 0
+        while True:
+            item = raw_queue.get()
+            if item is None:
+                break
+            timestamp, frame = item
+
+            # Resize the frame to 640x480 if necessary. Resizing first means the colour
+            # conversion below only touches the (usually smaller) output image.
+            if frame.shape[0] != self.img_height or frame.shape[1] != self.img_width:
+                out_shape = (self.img_height, self.img_width) + frame.shape[2:]
+                if resize_bufs is None or resize_bufs[0].shape != out_shape:
+                    resize_bufs = [np.empty(out_shape, frame.dtype) for _ in range(frame_queue.maxsize + 3)]
+                out = resize_bufs[buf_idx]
+                buf_idx = (buf_idx + 1) % len(resize_bufs)
+                frame = cv2.resize(frame, size, dst=out)
+
+            # Check if the frame is in BGR format (default for OpenCV) and convert to RGB in place.
+            # Each frame is either fresh from retrieve() or a resize buffer nobody references any more.
             if len(frame.shape) == 3 and frame.shape[2] == 3:
-                frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=frame)
+
+            frame_queue.put((timestamp, frame))
+        frame_queue.put(None)
+
+    def _dispatch(self):
+        """
+        Executes the callback function, if set, with each preprocessed frame.
+        """
+        frame_queue = self._frame_queue
+        while True:
+            item = frame_queue.get()
+            if item is None:
+                break
+            timestamp, frame = item
 
-            # Resize the frame to 640x480 if necessary
-            frame = cv2.resize(frame, (self.img_width, self.img_height))
             # Lock and execute callback function if set.
             try:
                 with self.callback_and_param_lock:
                     if self.callback_func is not None:
+                        # The state is read when the frame is dispatched, so that frames still
+                        # queued when the state changes are handled in the new state
                         self.callback_func(self.camera_running_state, timestamp, frame, *self.callback_args,
                                            **self.callback_kwargs)
             except Exception as e:
+                # A frame that the callback fails on is only logged; the next frames are still dispatched
                 Log.e(str(e))
-                sys.exit(1)
 
     def open(self):
         """
@@ -89,11 +180,18 @@ class WebCamCamera(Camera):
             Log.e("Failed to open webcam camera")
             raise Exception("Failed to open webcam camera")
 
-        # Configurer la résolution et le FPS après l'ouverture
+        # Demander le MJPG avant la résolution et le FPS: DirectShow négocie alors le format
+        # une seule fois, sans retomber sur un format non compressé plus lent (YUY2)
+        self._cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
         self._cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.img_width)
         self._cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.img_height)
         self._cap.set(cv2.CAP_PROP_FPS, self.cam_fps)
 
+        # Première frame jetée: elle absorbe la réinitialisation du pilote
+        self._cap.read()
+        fourcc = int(self._cap.get(cv2.CAP_PROP_FOURCC))
+        Log.i("WebCam format: " + "".join(chr((fourcc >> (8 * i)) & 0xFF) for i in range(4)))
+
         self._create_capture_thread()
 
     def close(self):
@@ -102,8 +200,10 @@ class WebCamCamera(Camera):
         """
         Log.i("WebCam closed")
         if self._camera_thread is not None:
-            self._camera_thread_running = False
-            self._camera_thread.join()
+            self._stop_event.set()
+            # The grab thread pushes the end sentinel through the preprocessing and callback stages
+            for thread in self._pipeline_threads:
+                thread.join()
         if not self._cap.isOpened():
             self._cap.release()
 
@@ -122,6 +222,6 @@ class WebCamCamera(Camera):
         super().set_on_image_callback(func, args, kwargs)
 
     def release(self):
-        self._camera_thread_running = False
+        self._stop_event.set()
         self._camera_thread.join()
         self.close()
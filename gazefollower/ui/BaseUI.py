@@ -13,12 +13,14 @@ class BaseUI(object):
         win (psychopy.visual.Window|pygame.Surface): The window to use.
         backend_name (str): The name of the backend (PsychoPy) to use for rendering, default is 'PsychoPy'.
         bg_color (Tuple): Background color for pygame screen.
+        dirty_rect_updates (bool): If True, the pygame backend only clears and updates the regions
+            that changed between frames (see PyGameUIBackend). Ignored by PsychoPy.
     """
-    def __init__(self, win, backend_name: str = "PyGame", bg_color=(255, 255, 255)):
+    def __init__(self, win, backend_name: str = "PyGame", bg_color=(255, 255, 255), dirty_rect_updates=False):
         # backend
         self.backend_name = backend_name.lower()
         if self.backend_name == "pygame":
-            self.backend: UIBackend = PyGameUIBackend(win, bg_color=bg_color)
+            self.backend: UIBackend = PyGameUIBackend(win, bg_color=bg_color, dirty_rect_updates=dirty_rect_updates)
         elif self.backend_name == "psychopy":
             self.backend: UIBackend = PsychoPyUIBackend(win)
         else:
@@ -8,6 +8,54 @@ from gazefollower.calibration import CalibrationController
 from .BaseUI import BaseUI
 from ..misc import DefaultConfig
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _group_average_numpy(inverse, n_groups, labels, predictions):
+    """
+    Average the label and prediction rows of each group.
+
+    Parameters:
+        inverse (np.ndarray): Group index of every row, in [0, n_groups).
+        n_groups (int): Number of groups.
+        labels (np.ndarray): (N, label_dim) label rows.
+        predictions (np.ndarray): (N, pred_dim) prediction rows.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (n_groups, label_dim) and (n_groups, pred_dim) averages.
+    """
+    counts = np.bincount(inverse, minlength=n_groups).reshape(-1, 1)
+    sum_labels = np.zeros((n_groups, labels.shape[1]))
+    sum_predictions = np.zeros((n_groups, predictions.shape[1]))
+    np.add.at(sum_labels, inverse, labels)
+    np.add.at(sum_predictions, inverse, predictions)
+    return sum_labels / counts, sum_predictions / counts
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _group_average(inverse, n_groups, labels, predictions):
+        """Same as _group_average_numpy, as a single fused loop over the rows."""
+        sum_labels = np.zeros((n_groups, labels.shape[1]))
+        sum_predictions = np.zeros((n_groups, predictions.shape[1]))
+        counts = np.zeros(n_groups)
+        for i in range(inverse.shape[0]):
+            g = inverse[i]
+            counts[g] += 1.0
+            for j in range(labels.shape[1]):
+                sum_labels[g, j] += labels[i, j]
+            for j in range(predictions.shape[1]):
+                sum_predictions[g, j] += predictions[i, j]
+        for g in range(n_groups):
+            sum_labels[g] /= counts[g]
+            sum_predictions[g] /= counts[g]
+        return sum_labels, sum_predictions
+else:
+    _group_average = _group_average_numpy
+
 
 class CalibrationUI(BaseUI):
     def __init__(self, win, backend_name: str = "PyGame", bg_color=(255, 255, 255),
@@ -15,7 +63,9 @@ class CalibrationUI(BaseUI):
         """
         Initializes the Calibration UI.
         """
-        super().__init__(win, backend_name, bg_color)
+        # Apart from the text screens, only the calibration target changes between frames:
+        # redraw the changed regions instead of the whole window
+        super().__init__(win, backend_name, bg_color, dirty_rect_updates=True)
 
         self.config = config
         self.error_bar_color = (0, 255, 0)  # Green color for the error bar
@@ -24,6 +74,10 @@ class CalibrationUI(BaseUI):
         self._sound_id = "beep"
         self.backend.load_sound(self.config.cali_target_sound, self._sound_id)
 
+        # Calibration target converted and scaled once, drawn every frame
+        self._cali_target_img = self.backend.prepare_image(self.config.cali_target_img,
+                                                           self.config.cali_target_size)
+
         self.target_position: tuple = (960, 540)
         self.target_progress: int = 0
 
@@ -35,9 +89,10 @@ class CalibrationUI(BaseUI):
         """Draws the guidance text for the user."""
         self.running = True
         # texts = instruction_text.split("\n")
+        self.backend.mark_full_refresh()
         while self.running:
-            # listen event
-            self.backend.listen_event(self)
+            # listen event; the text is static, so sleep until there is input
+            self.backend.idle_listen(self)
             # for pygame
             self.backend.before_draw()
             # draw texts
@@ -49,8 +104,9 @@ class CalibrationUI(BaseUI):
         """
         Return False to continue the calibration progress and Return True to stop the calibration.
         """
+        self.backend.mark_full_refresh()
         while not cali_controller.cali_model_fitted:
-            self.backend.listen_event(self, skip_event=True)
+            self.backend.idle_listen(self, skip_event=True)
             # for pygame
             self.backend.before_draw()
             # draw texts
@@ -82,7 +138,7 @@ class CalibrationUI(BaseUI):
         else:
             text = "Calibration échouée."
 
-        uni_p, avg_labels, avg_predictions = [], [], []
+        avg_labels, avg_predictions = [], []
         if cali_controller.predictions is not None:
             text += "\n\nPoint rouge: cible | Point vert: prédiction"
             ids = np.array(cali_controller.feature_ids)
@@ -97,21 +153,26 @@ class CalibrationUI(BaseUI):
             if predictions_flat.shape != (n_point * n_frame, 2):
                 raise ValueError("Predictions shape does not match feature_ids")
 
-            uni_p = np.unique(point_ids)
-            avg_labels = np.zeros((len(uni_p), label_dim))
-            avg_predictions = np.zeros((len(uni_p), predictions_flat.shape[1]))
-
-            for idx, point_id in enumerate(uni_p):
-                mask = (point_ids == point_id)
+            # Group the frames of each calibration point in a single pass
+            uni_p, inverse = np.unique(point_ids, return_inverse=True)
+            mean_labels, mean_predictions = _group_average(
+                inverse.ravel(), len(uni_p),
+                np.ascontiguousarray(labels_flat, dtype=np.float64),
+                np.ascontiguousarray(predictions_flat, dtype=np.float64))
 
-                avg_label = np.mean(labels_flat[mask], axis=0)
-                avg_pred = np.mean(predictions_flat[mask], axis=0)
+            # convert_to_pixel is element-wise: convert all the points at once, one column per axis
+            avg_labels = np.column_stack(cali_controller.convert_to_pixel(mean_labels.T))
+            avg_predictions = np.column_stack(cali_controller.convert_to_pixel(mean_predictions.T))
 
-                avg_labels[idx] = cali_controller.convert_to_pixel(avg_label)
-                avg_predictions[idx] = cali_controller.convert_to_pixel(avg_pred)
+            # Pixel positions are fixed while the result is shown: round them once
+            avg_labels = np.rint(avg_labels).astype(int).tolist()
+            avg_predictions = np.rint(avg_predictions).astype(int).tolist()
 
         text += "\n\n\nAppuyez sur ESPACE pour CONTINUER  |  R pour RECALIBRER"
+        self.backend.mark_full_refresh()
         while self.running:
+            # The result does not change: sleep until a key is pressed instead of redrawing flat out
+            self.backend.wait_events()
             key = self.backend.listen_keys(key=('space', 'r'))
             if key == 'space':
                 return True
@@ -124,11 +185,9 @@ class CalibrationUI(BaseUI):
                 text_color=self._color_black)
 
             if cali_controller.predictions is not None:
-                for n, _ in enumerate(uni_p):
-                    avg_label = avg_labels[n]
-                    avg_prediction = avg_predictions[n]
-                    self.backend.draw_circle(avg_label[0], avg_label[1], 4, self._color_red)
-                    self.backend.draw_circle(avg_prediction[0], avg_prediction[1], 4, self._color_green)
+                self.backend.draw_circles(avg_labels, 4, self._color_red)
+                self.backend.draw_circles(avg_predictions, 4, self._color_green)
+                for avg_label, avg_prediction in zip(avg_labels, avg_predictions):
                     self.backend.draw_line(avg_label[0], avg_label[1], avg_prediction[0], avg_prediction[1],
                                            self._color_gray, line_width=2)
             self.backend.after_draw()
@@ -138,21 +197,24 @@ class CalibrationUI(BaseUI):
 
     def draw(self, cali_controller: CalibrationController):
         last_x, last_y = -1, -1
+        # The screen and target sizes do not change during the calibration
+        screen_w, screen_h = self.backend.get_screen_size()
+        cali_img_w, cali_img_h = self.config.cali_target_size
+        half_w, half_h = cali_img_w // 2, cali_img_h // 2
+        self.backend.mark_full_refresh()
         while cali_controller.calibrating:
             # listen event
             self.backend.listen_event(self, skip_event=True)
             # for pygame
             self.backend.before_draw()
             # draw dot
-            cali_img_size = self.config.cali_target_size
-            target_x = int(np.round(cali_controller.x * self.backend.get_screen_size()[0]))
-            target_y = int(np.round(cali_controller.y * self.backend.get_screen_size()[1]))
-            draw_rect = (target_x - cali_img_size[0] // 2, target_y - cali_img_size[1] // 2,
-                         cali_img_size[0], cali_img_size[1])
+            target_x = round(cali_controller.x * screen_w)
+            target_y = round(cali_controller.y * screen_h)
+            draw_rect = (target_x - half_w, target_y - half_h, cali_img_w, cali_img_h)
             if target_x != last_x or target_y != last_y:
                 self.backend.play_sound(self._sound_id)
                 last_x, last_y = target_x, target_y
-            self.backend.draw_image(self.config.cali_target_img, draw_rect)
+            self.backend.draw_image(self._cali_target_img, draw_rect)
             self.backend.draw_text(str(cali_controller.progress), self.font_name, self.row_font_size, self._color_white,
                                    draw_rect)
             # flip the screen
@@ -2,6 +2,7 @@
 # Author: GC Zhu
 # Email: zhugc2016@gmail.com
 
+from collections import OrderedDict
 from typing import Tuple
 
 import cv2
@@ -10,6 +11,12 @@ import numpy as np
 import pygame
 
 
+def _ensure_mixer():
+    """Initialize pygame.mixer on first use, so screens without audio never open an audio device."""
+    if not pygame.mixer.get_init():
+        pygame.mixer.init()
+
+
 class UIBackend:
     """
     UIBackend provides an interface for graphical operations on a window,
@@ -46,6 +53,19 @@ class UIBackend:
         """
         raise NotImplementedError
 
+    def draw_circles(self, points, radius: int, color: Tuple[int, int, int]):
+        """
+        Draw several circles of the same radius and color on the screen.
+        Backends may override this to submit all the circles at once.
+
+        Parameters:
+            points: Sequence of (x, y) circle centers.
+            radius (int): Radius of the circles.
+            color (Tuple[int, int, int]): RGB color of the circles (0-255).
+        """
+        for x, y in points:
+            self.draw_circle(x, y, radius, color)
+
     def draw_line(self, sx: int, sy: int, ex: int, ey: int, color: Tuple[int, int, int], line_width: int):
         """
         Draw a straight line on the screen.
@@ -60,16 +80,48 @@ class UIBackend:
         """
         raise NotImplementedError
 
+    def draw_lines(self, points, color: Tuple[int, int, int], line_width: int, closed=False):
+        """
+        Draw a polyline through the given points.
+        Backends may override this to submit all the segments at once.
+
+        Parameters:
+            points: Sequence of (x, y) vertices.
+            color (Tuple[int, int, int]): RGB color of the lines (0-255).
+            line_width (int): Width of the lines in pixels.
+            closed (bool): If True, also connect the last point to the first one.
+        """
+        points = list(points)
+        if closed and len(points) > 2:
+            points.append(points[0])
+        for (sx, sy), (ex, ey) in zip(points, points[1:]):
+            self.draw_line(sx, sy, ex, ey, color, line_width)
+
     def draw_image(self, img: numpy.ndarray | str, rect: Tuple[int, int, int, int]):
         """
         Draw an image on the screen.
 
         Parameters:
-            img (numpy.ndarray | str): The image to be drawn, either as a NumPy array or a file path.
+            img (numpy.ndarray | str): The image to be drawn, either as a NumPy array, a file path
+                or an object returned by prepare_image.
             rect (Tuple[int, int, int, int]): Position and size of the image (x, y, width, height).
         """
         raise NotImplementedError
 
+    def prepare_image(self, img: numpy.ndarray | str, size: Tuple[int, int]):
+        """
+        Prepare an image that will be drawn repeatedly with draw_image at the given size.
+        Backends may return a pre-converted, pre-scaled image; by default it is returned unchanged.
+
+        Parameters:
+            img (numpy.ndarray | str): The image, either as a NumPy array or a file path.
+            size (Tuple[int, int]): Size (width, height) of the rect it will be drawn in.
+
+        Returns:
+            An image accepted by draw_image.
+        """
+        return img
+
     def draw_rect(self, rect: Tuple[int, int, int, int], color: Tuple[int, int, int], line_width: int):
         """
         Draw a rectangle on the screen.
@@ -115,6 +167,35 @@ class UIBackend:
         """
         raise NotImplementedError
 
+    def wait_events(self, timeout_ms: int = 16):
+        """
+        Sleep until an input event is available or the timeout expires.
+        Used by screens that do not need to redraw continuously. The default does not wait.
+
+        Parameters:
+            timeout_ms (int): Maximum waiting time in milliseconds.
+        """
+        pass
+
+    def idle_listen(self, host, timeout_ms: int = 16, skip_event=False):
+        """
+        Wait for user input (see wait_events), then dispatch it like listen_event.
+
+        Parameters:
+            host: The event handler object.
+            timeout_ms (int): Maximum waiting time in milliseconds.
+            skip_event (bool): If True, skip the event.
+        """
+        self.wait_events(timeout_ms)
+        self.listen_event(host, skip_event)
+
+    def mark_full_refresh(self):
+        """
+        Redraw the whole window on the next frame, e.g. after a scene change.
+        Only meaningful for backends that redraw changed regions only; the default does nothing.
+        """
+        pass
+
     def before_draw(self):
         """
         Perform any necessary operations before drawing, such as clearing the screen or setting up the drawing mode.
@@ -194,10 +275,10 @@ class PsychoPyUIBackend(UIBackend):
         self.small_font_size = 16
         self.table_font_size = 18
 
-        from psychopy import visual, event, sound
+        from psychopy import visual, event
 
         self.event = event
-        self.sound = sound
+        self._sound_module = None  # psychopy.sound, imported on first access
         # Predefine PsychoPy stimuli
         self.circle_stim = visual.ShapeStim(self.win, vertices='circle', size=(0, 0),
                                             fillColor=None, lineColor=None, colorSpace='rgb255',
@@ -214,9 +295,29 @@ class PsychoPyUIBackend(UIBackend):
                                            units="pix", anchor='top-left')
         self.mouse = self.event.Mouse()
         self.win_unit = self.win.units
+        # The window size does not change once it is open: resolve it once for the coordinate conversions
+        self._sw, self._sh = (int(v) for v in self.win.size)
+        self._half_w, self._half_h = self._sw // 2, self._sh // 2
+        # The window unit is fixed as well: pick the mouse position conversion once
+        self._mouse_convert = {
+            'pix': self._mouse_pix,
+            'norm': self._mouse_norm,
+            'height': self._mouse_height,
+        }.get(self.win_unit, self._mouse_unsupported)
         self._image_cache = {}
+        self._img_f32_buf = None  # Reused normalisation buffer for ndarray images
+        self._image_stim_source = None  # File whose image is currently uploaded to image_stim
+        self._coord_bufs = None  # Reused output buffers of pixel_to_psychopy_coordinate_batch
         self._sound_cache = {}
-        pygame.mixer.init()
+        self._sound_path_cache = {}  # Decoded sounds by file, shared by the ids loading the same file
+
+    @property
+    def sound(self):
+        """The psychopy.sound module, imported on first access (it loads an audio backend)."""
+        if self._sound_module is None:
+            from psychopy import sound
+            self._sound_module = sound
+        return self._sound_module
 
     def draw_circle(self, x, y, radius, color):
         self.circle_stim.pos = self.pixel_to_psychopy_coordinate(x, y)
@@ -225,6 +326,19 @@ class PsychoPyUIBackend(UIBackend):
         self.circle_stim.fillColor = color
         self.circle_stim.draw()
 
+    def draw_circles(self, points, radius, color):
+        # Convert all the centers at once, then only move the shared stimulus
+        if len(points) == 0:
+            return
+        points = np.asarray(points)
+        xs, ys = self.pixel_to_psychopy_coordinate_batch(points[:, 0], points[:, 1])
+        self.circle_stim.size = (2 * radius, 2 * radius)
+        self.circle_stim.lineColor = color
+        self.circle_stim.fillColor = color
+        for pos in zip(xs.tolist(), ys.tolist()):
+            self.circle_stim.pos = pos
+            self.circle_stim.draw()
+
     def draw_line(self, sx, sy, ex, ey, color, line_width):
         start = self.pixel_to_psychopy_coordinate(sx, sy)
         end = self.pixel_to_psychopy_coordinate(ex, ey)
@@ -239,12 +353,15 @@ class PsychoPyUIBackend(UIBackend):
             if img not in self._image_cache:
                 cv_img = cv2.imread(img)
                 cv_img = cv2.cvtColor(cv_img, cv2.COLOR_BGR2RGB)
-                self._image_cache[img] = cv_img
+                # Normalise once when the file is loaded, not on every draw
+                self._image_cache[img] = np.multiply(cv_img, np.float32(1 / 255.0), dtype=np.float32)
             image = self._image_cache[img]
-            original_height, original_width = image.shape[:2]
         else:
-            image = img
-            original_height, original_width = image.shape[:2]
+            # Normalise into a reused float32 buffer instead of a new float64 array per frame
+            if self._img_f32_buf is None or self._img_f32_buf.shape != img.shape:
+                self._img_f32_buf = np.empty(img.shape, dtype=np.float32)
+            image = np.multiply(img, np.float32(1 / 255.0), out=self._img_f32_buf)
+        original_height, original_width = image.shape[:2]
 
         aspect = original_width / original_height
         if (target_w / target_h) > aspect:
@@ -263,7 +380,12 @@ class PsychoPyUIBackend(UIBackend):
         # image = cv2.flip(image, 0)
         psychopy_pos = self.pixel_to_psychopy_coordinate(draw_x, draw_y)
         self.image_stim.pos = psychopy_pos
-        self.image_stim.image = image / 255.0
+        # Assigning .image uploads a new texture: skip it while the same file is drawn again.
+        # Array images (camera frames) change on every call and are always uploaded.
+        source = img if isinstance(img, str) else None
+        if source is None or source != self._image_stim_source:
+            self.image_stim.image = image
+            self._image_stim_source = source
         self.image_stim.size = (scaled_w, scaled_h)
         self.image_stim.flipVert = True
         self.image_stim.flipHoriz = True
@@ -290,7 +412,7 @@ class PsychoPyUIBackend(UIBackend):
         self.text_stim.draw()
 
     def get_screen_size(self):
-        return self.win.size
+        return self._sw, self._sh
 
     def pixel_to_psychopy_coordinate(self, x: int, y: int) -> Tuple:
         """
@@ -302,21 +424,39 @@ class PsychoPyUIBackend(UIBackend):
         Returns:
             tuple: Converted (x', y') in PsychoPy coordinate system (-1 to 1).
         """
-        screen_width, screen_height = self.win.size
-        x_psychopy = (x - screen_width // 2)
-        y_psychopy = -(y - screen_height // 2)
+        x_psychopy = (x - self._half_w)
+        y_psychopy = -(y - self._half_h)
         return x_psychopy, y_psychopy
 
+    def pixel_to_psychopy_coordinate_batch(self, xs, ys):
+        """
+        Convert arrays of PyGame pixel coordinates to PsychoPy coordinates in one go.
+
+        Parameters:
+            xs (array-like): X-coordinates in pixels.
+            ys (array-like): Y-coordinates in pixels, same length as xs.
+        Returns:
+            tuple: Converted (xs', ys') arrays. They are views of buffers reused by the next call.
+        """
+        xs = np.asarray(xs, dtype=np.float64)
+        n = len(xs)
+        if self._coord_bufs is None or self._coord_bufs.shape[1] < n:
+            self._coord_bufs = np.empty((2, max(n, 64)))
+        xs_out = self._coord_bufs[0, :n]
+        ys_out = self._coord_bufs[1, :n]
+        np.subtract(xs, self._half_w, out=xs_out)
+        np.subtract(self._half_h, ys, out=ys_out)
+        return xs_out, ys_out
+
     def listen_event(self, host, skip_event=False):
         if skip_event:
             return
         if 'space' in self.event.getKeys():
             host.running = False
-        pos = self.get_mouse_pos()
-        if (hasattr(host, 'stop_button_rect')
-                and ((host.stop_button_rect is not None)
-                     and self.pos_in_rect(pos, host.stop_button_rect)
-                     and self.mouse.getPressed()[0])):
+        stop_button_rect = getattr(host, 'stop_button_rect', None)
+        if (stop_button_rect is not None
+                and self.pos_in_rect(self.get_mouse_pos(), stop_button_rect)
+                and self.mouse.getPressed()[0]):
             host.running = False
 
     def before_draw(self):
@@ -327,22 +467,26 @@ class PsychoPyUIBackend(UIBackend):
 
     def get_mouse_pos(self):
         x, y = self.mouse.getPos()
-        screen_width, screen_height = self.win.size
-        if self.win_unit == 'pix':
-            x_pygame = x + screen_width // 2
-            y_pygame = -y + screen_height // 2
-        elif self.win_unit == 'norm':
-            x_pygame = (x + 1) * (screen_width // 2)
-            y_pygame = (1 - y) * (screen_height // 2)
-        elif self.win_unit == 'height':
-            x_pygame = x * (screen_height // 2) + (screen_width // 2)
-            y_pygame = -y * (screen_height // 2) + (screen_height // 2)
-        else:
-            raise ValueError(f"Unsupported unit: {self.win_unit}")
-        return x_pygame, y_pygame
+        return self._mouse_convert(x, y)
+
+    def _mouse_pix(self, x, y):
+        return x + self._half_w, -y + self._half_h
+
+    def _mouse_norm(self, x, y):
+        return (x + 1) * self._half_w, (1 - y) * self._half_h
+
+    def _mouse_height(self, x, y):
+        half_h = self._half_h
+        return x * half_h + self._half_w, -y * half_h + half_h
+
+    def _mouse_unsupported(self, x, y):
+        raise ValueError(f"Unsupported unit: {self.win_unit}")
 
     def load_sound(self, sound_path: str, sound_id: int | str):
-        sound_file = pygame.mixer.Sound(sound_path)
+        sound_file = self._sound_path_cache.get(sound_path)
+        if sound_file is None:
+            _ensure_mixer()
+            sound_file = self._sound_path_cache[sound_path] = pygame.mixer.Sound(sound_path)
         self._sound_cache[sound_id] = sound_file
 
     def play_sound(self, sound_id: int | str):
@@ -353,19 +497,20 @@ class PsychoPyUIBackend(UIBackend):
 
     def draw_text_on_screen_center(self, text: str, font_name: str, font_size: int, text_color=(0, 0, 0)):
         lines = text.split('\n')
-        sw, sh = self.get_screen_size()
+        sw, sh = self._sw, self._sh
         line_spacing = int(font_size * 0.2)
         total_h = len(lines) * font_size + (len(lines) - 1) * line_spacing
         start_y = (sh - total_h) // 2
 
+        line_h = font_size + line_spacing
         for idx, line in enumerate(lines):
-            y_pos = start_y + idx * (font_size + line_spacing)
+            y_pos = start_y + idx * line_h
             self.draw_text(line, self.font_name, font_size, text_color,
                            (0, y_pos, sw, font_size), align='center')
 
     def draw_text_in_bottom_right_corner(self, text: str, font_name: str, font_size: int, text_color=(0, 0, 0)):
         lines = text.split('\n')
-        sw, sh = self.get_screen_size()
+        sw, sh = self._sw, self._sh
 
         start_y = int(sh * 0.85)
         subregion_height = sh - start_y
@@ -375,8 +520,9 @@ class PsychoPyUIBackend(UIBackend):
 
         y_offset = start_y + (subregion_height - total_h) // 2
 
+        line_h = font_size + line_spacing
         for idx, line in enumerate(lines):
-            y_pos = y_offset + idx * (font_size + line_spacing)
+            y_pos = y_offset + idx * line_h
             self.draw_text(
                 text=line,
                 font_name=font_name,
@@ -394,33 +540,100 @@ class PsychoPyUIBackend(UIBackend):
 
 
 class PyGameUIBackend(UIBackend):
-    def __init__(self, win, bg_color=(255, 255, 255)):
+    # Maximum number of rendered text surfaces kept by draw_text
+    _TEXT_CACHE_MAX = 256
+    # Maximum number of rescaled images kept by draw_image
+    _SCALED_CACHE_MAX = 32
+    # Maximum number of composed multi-line text blocks
+    _TEXT_BLOCK_CACHE_MAX = 16
+
+    def __init__(self, win, bg_color=(255, 255, 255), dirty_rect_updates=False):
+        """
+        Parameters:
+            win: The pygame display surface.
+            bg_color: Background color used by before_draw.
+            dirty_rect_updates (bool): If True, before_draw only clears the regions drawn during
+                the previous frame and after_draw only pushes the changed regions to the display
+                (pygame.display.update) instead of flipping the whole screen. The first frame, and
+                the first one after mark_full_refresh, clear and flip the whole window.
+        """
         super().__init__(win)
+        self.dirty_rect_updates = dirty_rect_updates
+        self._dirty_rects = []  # Regions drawn during the frame (dirty_rect_updates only)
+        self._last_dirty_rects = []  # Regions drawn during the previous frame
+        self._cleared_rects = []  # Regions cleared by before_draw for this frame
+        self._needs_full_clear = True  # The next before_draw clears the whole window
+        self._full_update = True  # The whole window changed: flip instead of update
         self._sound_cache = {}
+        self._sound_path_cache = {}  # Decoded sounds by file, shared by the ids loading the same file
         self._image_cache = {}
+        self._scaled_cache = OrderedDict()
+        self._frame_surfs = {}  # Reused Surfaces for ndarray images (camera frames, eye patches), by size
+        self._events_this_frame = []  # Events drained once per frame by pump_events
+        self._dot_cache = {}
+        self._font_cache = {}
+        self._text_surface_cache = OrderedDict()
+        self._text_block_cache = OrderedDict()
+        # Surface blits queued by the draw calls, flushed with a single Surface.blits call
+        self._pending_blits = []
+        self._key_map_cache = {}  # Keys tuple of listen_keys -> {key code: value returned}
+        # Touches spéciales gérées sur tous les écrans (capture d'écran avec F12)
+        self._key_handlers = {
+            pygame.K_F12: self._take_screenshot,
+            pygame.K_PRINT: self._notify_print,
+            pygame.K_SYSREQ: self._notify_print,
+        }
+        # The window keeps its size once it is open
+        self._sw, self._sh = self.win.get_size()
         self.bg_color = bg_color
         pygame.font.init()
-        pygame.mixer.init()
+
+    def _flush_blits(self):
+        """
+        Perform the queued surface blits in one C-side loop.
+        Called before any direct drawing on the window, so the drawing order is kept.
+        """
+        if self._pending_blits:
+            if self.dirty_rect_updates:
+                self._dirty_rects.extend(self.win.blits(self._pending_blits))
+            else:
+                self.win.blits(self._pending_blits, doreturn=False)
+            self._pending_blits = []
+
+    def _mark_dirty(self, rect):
+        """Record a region drawn directly on the window."""
+        if self.dirty_rect_updates:
+            self._dirty_rects.append(rect)
 
     def draw_circle(self, x, y, radius, color):
-        pygame.draw.circle(self.win, color, (x, y), radius)
+        self._flush_blits()
+        self._mark_dirty(pygame.draw.circle(self.win, color, (x, y), radius))
+
+    def draw_circles(self, points, radius, color):
+        # One pre-drawn dot per (radius, color), stamped at every point with a single blits call
+        key = (radius, tuple(color))
+        dot = self._dot_cache.get(key)
+        if dot is None:
+            dot = pygame.Surface((2 * radius + 1, 2 * radius + 1), pygame.SRCALPHA)
+            pygame.draw.circle(dot, color, (radius, radius), radius)
+            dot = self._dot_cache[key] = dot.convert_alpha()
+        self._pending_blits.extend([(dot, (x - radius, y - radius)) for x, y in points])
 
     def draw_line(self, sx, sy, ex, ey, color, line_width):
-        pygame.draw.line(self.win, color, (sx, sy), (ex, ey), line_width)
-
-    def draw_image(self, img: np.ndarray | str, rect: Tuple[int, int, int, int]):
-        if isinstance(img, str):
-            if img not in self._image_cache:
-                image = pygame.image.load(img)
-                self._image_cache[img] = image
-            image = self._image_cache[img]
+        self._flush_blits()
+        self._mark_dirty(pygame.draw.line(self.win, color, (sx, sy), (ex, ey), line_width))
 
-        else:
-            img = cv2.rotate(img, cv2.ROTATE_90_COUNTERCLOCKWISE)
-            image = pygame.surfarray.make_surface(img)
+    def draw_lines(self, points, color, line_width, closed=False):
+        # A single pygame.draw.lines call draws the whole polyline
+        if len(points) > 1:
+            self._flush_blits()
+            self._mark_dirty(pygame.draw.lines(self.win, color, closed, points, line_width))
 
-        original_width, original_height = image.get_size()
-        target_width, target_height = rect[2], rect[3]
+    @staticmethod
+    def _fit_size(image_size, target_size):
+        """Largest size with the image aspect ratio that fits in target_size."""
+        original_width, original_height = image_size
+        target_width, target_height = target_size
 
         aspect_ratio = original_width / original_height
 
@@ -430,22 +643,135 @@ class PyGameUIBackend(UIBackend):
         else:
             new_width = target_width
             new_height = int(new_width / aspect_ratio)
+        return new_width, new_height
+
+    def prepare_image(self, img: np.ndarray | str, size: Tuple[int, int]):
+        if isinstance(img, str):
+            image = pygame.image.load(img)
+        else:
+            image = pygame.surfarray.make_surface(cv2.rotate(img, cv2.ROTATE_90_COUNTERCLOCKWISE))
+        image = image.convert_alpha()
+        return pygame.transform.smoothscale(image, self._fit_size(image.get_size(), size))
+
+    def draw_image(self, img: np.ndarray | str | pygame.Surface, rect: Tuple[int, int, int, int]):
+        if isinstance(img, pygame.Surface):
+            image = img
+        elif isinstance(img, str):
+            if img not in self._image_cache:
+                # Convert to the display format once, so blits and rescales skip the conversion
+                image = pygame.image.load(img).convert_alpha()
+                self._image_cache[img] = image
+            image = self._image_cache[img]
+
+        else:
+            # surfarray indexes pixels as [x, y]: a mirrored, transposed view gives the same
+            # orientation as the former 90° counter-clockwise rotation, without copying the frame.
+            # It is written into a persistent display-format Surface kept for each frame size.
+            frame_size = (img.shape[1], img.shape[0])
+            frame_surf = self._frame_surfs.get(frame_size)
+            if frame_surf is None:
+                frame_surf = self._frame_surfs[frame_size] = pygame.Surface(frame_size).convert()
+            elif any(surface is frame_surf for surface, _ in self._pending_blits):
+                # The previous image of this size is still queued: blit it before overwriting it
+                self._flush_blits()
+            frame_view = np.swapaxes(img[:, ::-1], 0, 1)
+            if frame_view.ndim == 2:
+                # Grayscale frame: repeat the gray level on the three channels (view, no copy)
+                frame_view = np.broadcast_to(frame_view[:, :, None], frame_view.shape + (3,))
+            pygame.surfarray.blit_array(frame_surf, frame_view)
+            image = frame_surf
 
-        scaled_image = pygame.transform.smoothscale(image, (new_width, new_height))
+        target_width, target_height = rect[2], rect[3]
+        new_width, new_height = self._fit_size(image.get_size(), (target_width, target_height))
+
+        # Images from prepare_image already have the right size
+        if image.get_size() == (new_width, new_height):
+            scaled_image = image
+        elif isinstance(img, str):
+            # Images loaded from a file are drawn again and again at the same size: keep the
+            # rescaled, display-format copy (least recently used evicted first)
+            scaled_key = (img, new_width, new_height)
+            scaled_image = self._scaled_cache.get(scaled_key)
+            if scaled_image is None:
+                scaled_image = pygame.transform.smoothscale(image, (new_width, new_height)).convert_alpha()
+                self._scaled_cache[scaled_key] = scaled_image
+                if len(self._scaled_cache) > self._SCALED_CACHE_MAX:
+                    self._scaled_cache.popitem(last=False)
+            else:
+                self._scaled_cache.move_to_end(scaled_key)
+        else:
+            scaled_image = pygame.transform.smoothscale(image, (new_width, new_height))
         x = rect[0] + (target_width - new_width) // 2
         y = rect[1] + (target_height - new_height) // 2
 
-        self.win.blit(scaled_image, (x, y))
+        self._pending_blits.append((scaled_image, (x, y)))
         # image = pygame.transform.scale(image, (rect[2], rect[3]))
         # self.win.blit(image, (rect[0], rect[1]))
 
     def draw_rect(self, rect: Tuple[int, int, int, int], color, line_width):
-        pygame.draw.rect(self.win, color, rect, line_width)
+        self._flush_blits()
+        self._mark_dirty(pygame.draw.rect(self.win, color, rect, line_width))
+
+    def _get_font(self, font_name, font_size):
+        """Return the font, created only once per (name, size): SysFont searches the system font registry."""
+        font_key = (font_name, font_size)
+        font = self._font_cache.get(font_key)
+        if font is None:
+            font = self._font_cache[font_key] = pygame.font.SysFont(font_name, font_size)
+        return font
+
+    def _render_text(self, text, font_name, font_size, text_color):
+        """Return the rendered surface of a line of text, reusing it while the same text is drawn."""
+        # Least recently used surfaces are evicted first
+        text_key = (text, font_name, font_size, tuple(text_color))
+        text_surface = self._text_surface_cache.get(text_key)
+        if text_surface is None:
+            font = self._get_font(font_name, font_size)
+            text_surface = self._text_surface_cache[text_key] = font.render(text, True, text_color)
+            if len(self._text_surface_cache) > self._TEXT_CACHE_MAX:
+                self._text_surface_cache.popitem(last=False)
+        else:
+            self._text_surface_cache.move_to_end(text_key)
+        return text_surface
+
+    def _render_text_block(self, text, font_name, font_size, text_color):
+        """
+        Compose the lines of a multi-line text into a single surface, laid out like
+        successive draw_text calls centered on the same vertical axis.
+
+        Returns the surface and its offset from (axis x, top of the first line).
+        """
+        block_key = (text, font_name, font_size, tuple(text_color))
+        block = self._text_block_cache.get(block_key)
+        if block is not None:
+            self._text_block_cache.move_to_end(block_key)
+            return block
+
+        line_h = font_size + int(font_size * 0.2)
+        half_size = font_size // 2
+        surfaces = [self._render_text(line, font_name, font_size, text_color) for line in text.split('\n')]
+        # Position of every line relative to the axis and to the top of the first line
+        positions = [(-(surf.get_width() // 2), idx * line_h + half_size - surf.get_height() // 2)
+                     for idx, surf in enumerate(surfaces)]
+        left = min(x for x, _ in positions)
+        top = min(y for _, y in positions)
+        width = max(x + surf.get_width() for (x, _), surf in zip(positions, surfaces)) - left
+        height = max(y + surf.get_height() for (_, y), surf in zip(positions, surfaces)) - top
+
+        block_surface = pygame.Surface((max(width, 1), max(height, 1)), pygame.SRCALPHA)
+        block_surface.fill((*text_color[:3], 0))
+        # Per-channel max copies the antialiased lines without blending them twice
+        block_surface.blits([(surf, (x - left, y - top), None, pygame.BLEND_RGBA_MAX)
+                             for (x, y), surf in zip(positions, surfaces)], doreturn=False)
+
+        block = self._text_block_cache[block_key] = (block_surface, left, top)
+        if len(self._text_block_cache) > self._TEXT_BLOCK_CACHE_MAX:
+            self._text_block_cache.popitem(last=False)
+        return block
 
     def draw_text(self, text: str, font_name: str, font_size: int, text_color: Tuple[int, int, int],
                   rect: Tuple[int, int, int, int], align='center'):
-        font = pygame.font.SysFont(font_name, font_size)
-        text_surface = font.render(text, True, text_color)
+        text_surface = self._render_text(text, font_name, font_size, text_color)
         text_rect = text_surface.get_rect()
         if align == 'center':
             text_rect.center = (rect[0] + rect[2] // 2, rect[1] + rect[3] // 2)
@@ -453,37 +779,79 @@ class PyGameUIBackend(UIBackend):
             text_rect.topleft = (rect[0], rect[1])
         elif align == 'right':
             text_rect.topright = (rect[0] + rect[2], rect[1])
-        self.win.blit(text_surface, text_rect)
+        self._pending_blits.append((text_surface, text_rect))
 
     def get_screen_size(self):
-        return self.win.get_size()
+        return self._sw, self._sh
+
+    def pump_events(self):
+        """
+        Drain the pygame event queue once for the current frame.
+        listen_event and listen_keys then read the drained events instead of polling pygame.
+        """
+        self._events_this_frame = pygame.event.get()
+
+    def _take_events(self):
+        """Return the events drained for this frame, each handed out to a single listener."""
+        events = self._events_this_frame
+        self._events_this_frame = []
+        return events
+
+    def wait_events(self, timeout_ms: int = 16):
+        # Events already drained for this frame are waiting to be handled: do not sleep
+        if self._events_this_frame:
+            return
+        # Sleep in SDL until an event arrives instead of spinning on an empty queue
+        event = pygame.event.wait(timeout_ms)
+        if event.type != pygame.NOEVENT:
+            # Put the event back so that it is drained with the others through pygame.event.get,
+            # like on every other path (the application may filter that call)
+            pygame.event.post(event)
+            self._events_this_frame = pygame.event.get()
+
+    def mark_full_refresh(self):
+        """Clear and flip the whole window on the next frame, e.g. after a scene change."""
+        self._needs_full_clear = True
 
     def before_draw(self):
-        self.win.fill(self.bg_color)
+        self.pump_events()
+        self._pending_blits = []
+        if self.dirty_rect_updates and not self._needs_full_clear:
+            # Only erase what the previous frame drew; the rest of the window is still background
+            fill, bg_color = self.win.fill, self.bg_color
+            for rect in self._last_dirty_rects:
+                fill(bg_color, rect)
+            self._cleared_rects = self._last_dirty_rects
+        else:
+            self.win.fill(self.bg_color)
+            self._needs_full_clear = False
+            self._full_update = True
 
     def listen_event(self, host, skip_event=False):
-        for event in pygame.event.get():
+        stop_button_rect = getattr(host, 'stop_button_rect', None)
+        key_handlers = self._key_handlers
+        for event in self._take_events():
             if skip_event:
                 continue
             if event.type == pygame.QUIT:
                 pygame.quit()
                 raise SystemExit
             if (event.type == pygame.MOUSEBUTTONDOWN
-                    and hasattr(host, 'stop_button_rect')
-                    and host.stop_button_rect is not None
-                    and self.pos_in_rect(event.pos, host.stop_button_rect)):
+                    and stop_button_rect is not None
+                    and self.pos_in_rect(event.pos, stop_button_rect)):
                 host.running = False
 
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_SPACE:
                     host.running = False
-                elif event.key == pygame.K_F12:
-                    # Capture d'écran avec F12
-                    self._take_screenshot()
-                elif event.key == pygame.K_PRINT or event.key == pygame.K_SYSREQ:
-                    # Ignorer Print Screen pour éviter de quitter
-                    print("💡 Utilisez F12 pour prendre une capture d'écran")
-                    pass
+                    continue
+                handler = key_handlers.get(event.key)
+                if handler is not None:
+                    handler()
+
+    def _notify_print(self):
+        """Ignore Print Screen pour éviter de quitter"""
+        print("💡 Utilisez F12 pour prendre une capture d'écran")
 
     def _take_screenshot(self):
         """Prend une capture d'écran de l'écran de calibration"""
@@ -501,6 +869,7 @@ class PyGameUIBackend(UIBackend):
             filepath = os.path.join(screenshots_dir, filename)
 
             # Sauvegarder la surface pygame actuelle
+            self._flush_blits()
             pygame.image.save(self.win, filepath)
 
             print(f"📸 Capture d'écran sauvegardée : {filepath}")
@@ -512,37 +881,64 @@ class PyGameUIBackend(UIBackend):
         Check for keyboard presses using PyGame's event system
 
         Args:
-            key: Tuple of pygame key constants to listen for (e.g., (K_SPACE, K_a))
+            key: Tuple of key names (e.g., ('space', 'a')) or of pygame key constants
+                (e.g., (K_SPACE, K_a)) to listen for
 
         Returns:
-            int: First matching key code pressed, or None if no match
-        """
-        for event in pygame.event.get():
+            The name (or key constant) of the first matching key pressed, or None if no match
+        """
+        # Key presses are matched by integer code: resolve the names once per keys tuple
+        key = tuple(key)
+        key_map = self._key_map_cache.get(key)
+        if key_map is None:
+            key_map = {}
+            for k in key:
+                if isinstance(k, int):
+                    key_map[k] = k
+                else:
+                    try:
+                        key_map[pygame.key.key_code(k)] = k
+                    except ValueError:
+                        pass
+            self._key_map_cache[key] = key_map
+        key_handlers = self._key_handlers
+        for event in self._take_events():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 raise SystemExit
             if event.type == pygame.KEYDOWN:
                 # Gestion des touches spéciales avant tout
-                if event.key == pygame.K_F12:
-                    self._take_screenshot()
-                    continue
-                elif event.key == pygame.K_PRINT or event.key == pygame.K_SYSREQ:
-                    print("💡 Utilisez F12 pour prendre une capture d'écran")
+                handler = key_handlers.get(event.key)
+                if handler is not None:
+                    handler()
                     continue
 
-                key_name = pygame.key.name(event.key)
-                if key_name in key:
-                    return key_name
+                pressed = key_map.get(event.key)
+                if pressed is not None:
+                    return pressed
         return None
 
     def after_draw(self):
-        pygame.display.flip()
+        self._flush_blits()
+        if self.dirty_rect_updates and not self._full_update:
+            changed = self._cleared_rects + self._dirty_rects
+            if changed:
+                pygame.display.update(changed)
+        else:
+            pygame.display.flip()
+        self._last_dirty_rects = self._dirty_rects
+        self._dirty_rects = []
+        self._cleared_rects = []
+        self._full_update = False
 
     def get_mouse_pos(self):
         return pygame.mouse.get_pos()
 
     def load_sound(self, sound_path: str, sound_id: int | str):
-        sound_file = pygame.mixer.Sound(sound_path)
+        sound_file = self._sound_path_cache.get(sound_path)
+        if sound_file is None:
+            _ensure_mixer()
+            sound_file = self._sound_path_cache[sound_path] = pygame.mixer.Sound(sound_path)
         self._sound_cache[sound_id] = sound_file
 
     def play_sound(self, sound_id: int | str):
@@ -552,35 +948,26 @@ class PyGameUIBackend(UIBackend):
         self._sound_cache[sound_id].stop()
 
     def draw_text_on_screen_center(self, text: str, font_name: str, font_size: int, text_color=(0, 0, 0)):
-        split_lines = text.split('\n')
-        sw, sh = self.get_screen_size()
+        n_lines = text.count('\n') + 1
+        sw, sh = self._sw, self._sh
         line_spacing = int(font_size * 0.2)
-        total_h = len(split_lines) * font_size + (len(split_lines) - 1) * line_spacing
+        total_h = n_lines * font_size + (n_lines - 1) * line_spacing
         start_y = (sh - total_h) // 2
 
-        for idx, line in enumerate(split_lines):
-            y_pos = start_y + idx * (font_size + line_spacing)
-            self.draw_text(line, font_name, font_size, text_color,
-                           (0, y_pos, sw, font_size), align='center')
+        block_surface, dx, dy = self._render_text_block(text, font_name, font_size, text_color)
+        self._pending_blits.append((block_surface, (sw // 2 + dx, start_y + dy)))
 
     def draw_text_in_bottom_right_corner(self, text: str, font_name: str, font_size: int, text_color=(0, 0, 0)):
-        split_lines = text.split('\n')
-        sw, sh = self.get_screen_size()
+        n_lines = text.count('\n') + 1
+        sw, sh = self._sw, self._sh
 
         start_y = int(sh * 0.85)
         subregion_height = sh - start_y
 
         line_spacing = int(font_size * 0.2)
-        total_text_height = len(split_lines) * font_size + (len(split_lines) - 1) * line_spacing
+        total_text_height = n_lines * font_size + (n_lines - 1) * line_spacing
 
         y_offset = start_y + (subregion_height - total_text_height) // 2
 
-        for idx, line in enumerate(split_lines):
-            y_pos = y_offset + idx * (font_size + line_spacing)
-            self.draw_text(
-                text=line,
-                font_name=font_name,
-                font_size=font_size,
-                text_color=text_color,
-                rect=(0, y_pos, sw, font_size),
-                align='center')
+        block_surface, dx, dy = self._render_text_block(text, font_name, font_size, text_color)
+        self._pending_blits.append((block_surface, (sw // 2 + dx, y_offset + dy)))
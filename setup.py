@@ -49,7 +49,7 @@ setup(
         'numpy',
         'opencv-python',
         'pandas',
-        'pygame',
+        'pygame>=2.0.1',
         'screeninfo',
     ],
 